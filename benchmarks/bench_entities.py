@@ -0,0 +1,110 @@
+"""Benchmark of the per-entity cost of Rako lights on a large bridge.
+
+Builds the entities of a synthetic 1000 channel bridge and reports the
+memory each light keeps, the time to create it and the time HA spends
+reading the properties it looks up on every state write, and the device
+info it reads when the light is added.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_entities
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import python_rako
+from python_rako.model import LevelCache, LevelCacheItem, RoomChannel, SceneCache
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.const import DOMAIN
+from custom_components.rako.light import RakoChannelLight, RakoLight, RakoRoomLight
+
+from .bench_state_update import MAC
+
+ROOMS = 100
+CHANNELS_PER_ROOM = 10
+READS = 100
+
+
+def _topology() -> list[python_rako.Light]:
+    lights: list[python_rako.Light] = []
+    for room in range(1, ROOMS + 1):
+        title = f"Room {room}"
+        lights.append(python_rako.RoomLight(room, title))
+        lights.extend(
+            python_rako.ChannelLight(
+                room, title, channel, "Default", f"Channel {channel}", ""
+            )
+            for channel in range(1, CHANNELS_PER_ROOM + 1)
+        )
+    return lights
+
+
+def _level_cache() -> LevelCache:
+    level_cache = LevelCache()
+    for room in range(1, ROOMS + 1):
+        for channel in range(1, CHANNELS_PER_ROOM + 1):
+            level_cache[RoomChannel(room, channel)] = LevelCacheItem(
+                0, room, channel, {scene: scene * 15 for scene in range(1, 18)}
+            )
+    return level_cache
+
+
+def _create(bridge: RakoBridge, lights: list[python_rako.Light]) -> list[RakoLight]:
+    return [
+        RakoChannelLight(bridge, light)
+        if isinstance(light, python_rako.ChannelLight)
+        else RakoRoomLight(bridge, light)  # type: ignore[arg-type]
+        for light in lights
+    ]
+
+
+async def main() -> None:
+    """Report memory and property read time per light."""
+    hass = SimpleNamespace(data={DOMAIN: {}}, loop=asyncio.get_running_loop())
+    bridge = RakoBridge("127.0.0.1", 9761, "bench", MAC, "bench", hass)
+    bridge._set_cache_state(_level_cache(), SceneCache())
+
+    # the python_rako lights are discovered per setup, entities may keep them
+    gc.collect()
+    tracemalloc.start()
+    entities = _create(bridge, _topology())
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        for entity in entities:
+            entity.unique_id  # pylint: disable=pointless-statement
+            entity.name  # pylint: disable=pointless-statement
+    reads = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        for entity in entities:
+            entity.device_info  # pylint: disable=pointless-statement
+    device_reads = time.perf_counter() - start
+
+    topology = _topology()
+    start = time.perf_counter()
+    for _ in range(READS):
+        _create(bridge, topology)
+    create = time.perf_counter() - start
+
+    count = len(entities)
+    print(
+        f"{count} lights: {memory / count:.0f} bytes each, "
+        f"created in {create / READS / count * 1e6:.2f} us, "
+        f"unique_id + name read in {reads / READS / count * 1e6:.2f} us, "
+        f"device_info in {device_reads / READS / count * 1e6:.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+"""Benchmark of the datagram receive path over a local UDP socket.
+
+Replays synthetic status datagrams from 127.0.0.1 through the previous
+pull-based ``next_pushed_message`` loop and through ``RakoDatagramProtocol``,
+reporting the datagrams handled, event loop CPU time per datagram and
+event loop latency while receiving.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_listener
+"""
+from __future__ import annotations
+
+import asyncio
+from multiprocessing import Process
+import random
+import socket
+import statistics
+import time
+from types import SimpleNamespace
+
+from python_rako.helpers import get_dg_listener
+from python_rako.model import StatusMessage
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.const import DOMAIN
+from custom_components.rako.listener import RakoDatagramProtocol
+
+from .bench_state_update import (
+    CHANNELS_PER_ROOM,
+    MAC,
+    ROOMS,
+    _BenchLight,
+    _status_bytes,
+)
+
+PORT = 19761
+PACKETS = 5000
+RATE = 5000  # datagrams per second
+
+
+def _create_bridge(loop: asyncio.AbstractEventLoop) -> RakoBridge:
+    hass = SimpleNamespace(data={DOMAIN: {}}, loop=loop)
+    bridge = RakoBridge("127.0.0.1", PORT, "bench", MAC, "bench", hass)
+    hass.data[DOMAIN][MAC] = {"rako_bridge_client": bridge, "rako_light_map": {}}
+    for room in range(1, ROOMS + 1):
+        for channel in range(CHANNELS_PER_ROOM + 1):
+            bridge._add_listening_light(_BenchLight(room, channel))
+    return bridge
+
+
+def _packets() -> list[bytes]:
+    rnd = random.Random(0)
+    return [
+        bytes(
+            _status_bytes(
+                rnd.randint(1, ROOMS),
+                rnd.randint(0, CHANNELS_PER_ROOM),
+                rnd.randint(0, 255),
+            )
+        )
+        for _ in range(PACKETS)
+    ]
+
+
+def _send(
+    packets: list[bytes],
+    port: int = PORT,
+    rate: float = RATE,
+    times: list[float] | None = None,
+) -> None:
+    """Send the packets at rate, or at the given times, from another process."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.perf_counter()
+    try:
+        for i, packet in enumerate(packets):
+            sock.sendto(packet, ("127.0.0.1", port))
+            due = times[i] if times is not None else i / rate
+            if (delay := start + due - time.perf_counter()) > 0:
+                time.sleep(delay)
+    finally:
+        sock.close()
+
+
+async def _probe_loop_latency(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.001)
+        lags.append(loop.time() - start - 0.001)
+
+
+async def _run(label: str, receive) -> None:  # type: ignore[no-untyped-def]
+    loop = asyncio.get_running_loop()
+    bridge = _create_bridge(loop)
+    lags: list[float] = []
+    stop = asyncio.Event()
+    async with receive(bridge) as done:
+        probe = asyncio.create_task(_probe_loop_latency(lags, stop))
+        sender = Process(target=_send, args=(_packets(),))
+        cpu_start = time.process_time()
+        sender.start()
+        try:
+            await asyncio.wait_for(done(bridge), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+        cpu = time.process_time() - cpu_start
+        stop.set()
+        await probe
+        await loop.run_in_executor(None, sender.join)
+
+    lags.sort()
+    print(
+        f"{label:>19}: {bridge.messages_received:>5}/{PACKETS} datagrams, "
+        f"{cpu / max(bridge.messages_received, 1) * 1e6:.1f} us CPU each, loop lag "
+        f"p50 {statistics.median(lags) * 1000:.2f} ms "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:.2f} ms"
+    )
+
+
+async def _until_received(bridge: RakoBridge) -> None:
+    while bridge.messages_received < PACKETS:
+        await asyncio.sleep(0.001)
+
+
+class _PullLoop:
+    """The previous receive path: one awaited recv per datagram."""
+
+    def __init__(self, bridge: RakoBridge) -> None:
+        self._bridge = bridge
+        self._task: asyncio.Task | None = None
+
+    async def _worker(self) -> None:
+        async with get_dg_listener(PORT) as listener:
+            while True:
+                message = await self._bridge.next_pushed_message(listener)
+                self._bridge.async_message_received()
+                if message and isinstance(message, StatusMessage):
+                    self._bridge.async_dispatch_status(message)
+
+    async def __aenter__(self):  # type: ignore[no-untyped-def]
+        self._task = asyncio.create_task(self._worker())
+        await asyncio.sleep(0.1)
+        return _until_received
+
+    async def __aexit__(self, *args: object) -> None:
+        assert self._task
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class _Protocol:
+    """The native DatagramProtocol receive path."""
+
+    def __init__(self, bridge: RakoBridge) -> None:
+        self._bridge = bridge
+        self._transport: asyncio.BaseTransport | None = None
+
+    async def __aenter__(self):  # type: ignore[no-untyped-def]
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: RakoDatagramProtocol(
+                {self._bridge.host: self._bridge}, loop.create_future()
+            ),
+            local_addr=("0.0.0.0", PORT),
+        )
+        return _until_received
+
+    async def __aexit__(self, *args: object) -> None:
+        assert self._transport
+        self._transport.close()
+
+
+async def main() -> None:
+    """Run both receive paths over the same packet stream."""
+    await _run("next_pushed_message", _PullLoop)
+    await _run("DatagramProtocol", _Protocol)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+"""Load benchmark replaying bridge traffic through the push path.
+
+Plays a recording made with ``benchmarks.record``, or a synthetic one, over
+UDP from 127.0.0.1 to the listener started by ``listen_for_state_updates``,
+at the recorded pace or at fixed rates. The lights are real ``RakoLight``
+entities on a fake Home Assistant core that count their state writes.
+Datagrams from several recorded bridges are replayed as one bridge.
+
+Reports throughput, p50/p99 dispatch latency and state writes per run.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_replay [rako.rec] [--rate 1000 5000]
+        [--flush-window 0.05]
+
+A rate of 0 replays at the recorded pace.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from multiprocessing import Process
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+import python_rako
+from python_rako.helpers import deserialise_byte_list
+from python_rako.model import (
+    LevelCache,
+    LevelCacheItem,
+    RoomChannel,
+    SceneCache,
+    StatusMessage,
+)
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.const import DOMAIN
+from custom_components.rako.light import RakoChannelLight, RakoLight, RakoRoomLight
+
+from .bench_listener import _send
+from .bench_state_update import CHANNELS_PER_ROOM, MAC, ROOMS, _status_bytes
+from .record import Datagram, read_recording
+
+PORT = 19762
+SYNTHETIC_DATAGRAMS = 20_000
+SCENE_SHARE = 0.1
+
+
+class _CountingWrites:
+    """Count state writes instead of writing them to Home Assistant."""
+
+    state_writes = 0
+
+    def async_write_ha_state(self) -> None:
+        self.state_writes += 1
+
+
+class _ReplayRoomLight(_CountingWrites, RakoRoomLight):
+    pass
+
+
+class _ReplayChannelLight(_CountingWrites, RakoChannelLight):
+    pass
+
+
+class _LatencySamples(list):
+    """Exact dispatch latencies, standing in for the bridge's histogram."""
+
+    add = list.append
+
+
+def _scene_bytes(room: int, scene: int) -> list[int]:
+    """Build a SET_SCENE status datagram as sent by the bridge."""
+    body = [7, room // 256, room % 256, 0, 49, 1, scene]
+    return [ord("S")] + body + [(256 - sum(body)) % 256]
+
+
+def _synthetic_recording() -> list[Datagram]:
+    rnd = random.Random(0)
+    datagrams = []
+    for index in range(SYNTHETIC_DATAGRAMS):
+        room = rnd.randint(1, ROOMS)
+        if rnd.random() < SCENE_SHARE:
+            data = _scene_bytes(room, rnd.randint(0, 4))
+        else:
+            data = _status_bytes(
+                room, rnd.randint(1, CHANNELS_PER_ROOM), rnd.randint(0, 255)
+            )
+        datagrams.append((index * 0.001, "127.0.0.1", bytes(data)))
+    return datagrams
+
+
+def _topology(datagrams: list[Datagram]) -> dict[int, set[int]]:
+    """Return the channels of each room the recording mentions."""
+    rooms: dict[int, set[int]] = {}
+    for _, _, data in datagrams:
+        message = deserialise_byte_list(list(data))
+        if isinstance(message, StatusMessage):
+            channels = rooms.setdefault(message.room, set())
+            if message.channel:
+                channels.add(message.channel)
+    return rooms
+
+
+def _level_cache(rooms: dict[int, set[int]]) -> LevelCache:
+    rnd = random.Random(0)
+    level_cache = LevelCache()
+    for room, channels in rooms.items():
+        for channel in channels:
+            level_cache[RoomChannel(room, channel)] = LevelCacheItem(
+                0, room, channel, {scene: rnd.randint(0, 255) for scene in range(1, 18)}
+            )
+    return level_cache
+
+
+def _replay(datagrams: list[Datagram], rate: float) -> None:
+    """Send the datagrams at rate, or at their recorded pace if rate is 0."""
+    if rate:
+        _send([data for _, _, data in datagrams], port=PORT, rate=rate)
+    else:
+        _send(
+            [data for _, _, data in datagrams],
+            port=PORT,
+            times=[offset for offset, _, _ in datagrams],
+        )
+
+
+async def _run(
+    datagrams: list[Datagram], rooms: dict[int, set[int]], rate: float, window: float
+) -> None:
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        data={DOMAIN: {}},
+        loop=loop,
+        bus=SimpleNamespace(async_fire=lambda *args, **kwargs: None),
+    )
+    bridge = RakoBridge(
+        "127.0.0.1", PORT, "replay", MAC, "replay", hass, state_flush_window=window
+    )
+    hass.data[DOMAIN][MAC] = {
+        "rako_bridge_client": bridge,
+        "rako_light_map": {},
+        "rako_switch_map": {},
+    }
+    bridge._set_cache_state(_level_cache(rooms), SceneCache())
+    bridge.dispatch_latency = _LatencySamples()
+
+    lights: list[RakoLight] = []
+    for room, channels in rooms.items():
+        title = f"Room {room}"
+        lights.append(_ReplayRoomLight(bridge, python_rako.RoomLight(room, title)))
+        for channel in sorted(channels):
+            lights.append(
+                _ReplayChannelLight(
+                    bridge,
+                    python_rako.ChannelLight(
+                        room, title, channel, "Default", f"Channel {channel}", ""
+                    ),
+                )
+            )
+    for light in lights:
+        light.hass = hass
+        await light.async_added_to_hass()
+    await asyncio.sleep(0.1)
+
+    sender = Process(target=_replay, args=(datagrams, rate))
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    sender.start()
+    deadline = loop.time() + (len(datagrams) / rate if rate else datagrams[-1][0]) + 5
+    while bridge.messages_received < len(datagrams) and loop.time() < deadline:
+        await asyncio.sleep(0.001)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    await loop.run_in_executor(None, sender.join)
+    await asyncio.sleep(window)
+
+    for light in lights:
+        await light.async_will_remove_from_hass()
+
+    received = bridge.messages_received
+    latencies = sorted(bridge.dispatch_latency) or [0.0]
+    writes = sum(light.state_writes for light in lights)  # type: ignore[attr-defined]
+    label = f"{rate:,.0f}/s" if rate else "recorded"
+    print(
+        f"{label:>10}: {received:>6}/{len(datagrams)} datagrams in {wall:.2f}s, "
+        f"{cpu / max(received, 1) * 1e6:.1f} us CPU each, dispatch "
+        f"p50 {statistics.median(latencies) * 1e6:.1f} us "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.1f} us, "
+        f"{writes} state writes, {bridge.suppressed_state_writes} suppressed"
+    )
+
+
+async def main() -> None:
+    """Replay a recording at each requested rate."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", nargs="?", help="made with benchmarks.record")
+    parser.add_argument(
+        "--rate", type=float, nargs="+", default=[1000, 5000], help="datagrams/s"
+    )
+    parser.add_argument("--flush-window", type=float, default=0.0, help="seconds")
+    args = parser.parse_args()
+
+    if args.recording:
+        with open(args.recording, "rb") as file:
+            datagrams = list(read_recording(file))
+    else:
+        datagrams = _synthetic_recording()
+    rooms = _topology(datagrams)
+    print(
+        f"{len(datagrams)} datagrams, {len(rooms)} rooms, "
+        f"{sum(map(len, rooms.values()))} channels, "
+        f"flush window {args.flush_window}s"
+    )
+    for rate in args.rate:
+        await _run(datagrams, rooms, rate, args.flush_window)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""Micro-benchmark for the push listener dispatch path.
+
+Replays a stream of Rako status datagrams through the bridge's
+``async_dispatch_status`` and compares it with the previous unique ID based
+lookup, then replays scene recalls and compares the precomputed scene table
+with scanning the level cache.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_state_update
+"""
+from __future__ import annotations
+
+import random
+import time
+from types import SimpleNamespace
+
+from python_rako.helpers import deserialise_byte_list
+from python_rako.model import (
+    ChannelStatusMessage,
+    LevelCache,
+    LevelCacheItem,
+    RoomChannel,
+    SceneCache,
+    SceneStatusMessage,
+    StatusMessage,
+)
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.const import DOMAIN
+from custom_components.rako.util import create_unique_id
+
+ROOMS = 40
+CHANNELS_PER_ROOM = 8
+MESSAGES = 200_000
+SCENE_MESSAGES = 20_000
+MAC = "00:11:22:33:44:55"
+
+
+class _BenchLight:
+    """Stand-in for a RakoLight that records brightness without HA."""
+
+    def __init__(self, room_id: int, channel_id: int) -> None:
+        self.room_id = room_id
+        self.channel_id = channel_id
+        self.unique_id = create_unique_id(MAC, room_id, channel_id)
+        self.brightness = 0
+
+
+def _status_bytes(room: int, channel: int, brightness: int) -> list[int]:
+    """Build a SET_LEVEL status datagram as sent by the bridge."""
+    body = [7, room // 256, room % 256, channel, 52, 1, brightness]
+    return [ord("S")] + body + [(256 - sum(body)) % 256]
+
+
+def _recorded_stream(count: int) -> list[StatusMessage]:
+    rnd = random.Random(0)
+    stream = []
+    for _ in range(count):
+        room = rnd.randint(1, ROOMS)
+        channel = rnd.randint(0, CHANNELS_PER_ROOM)
+        message = deserialise_byte_list(
+            _status_bytes(room, channel, rnd.randint(0, 255))
+        )
+        stream.append(message)
+    return stream
+
+
+def _scene_stream(count: int) -> list[StatusMessage]:
+    rnd = random.Random(0)
+    return [
+        SceneStatusMessage(rnd.randint(1, ROOMS), 0, rnd.randint(0, 4))
+        for _ in range(count)
+    ]
+
+
+def _level_cache() -> LevelCache:
+    rnd = random.Random(0)
+    level_cache = LevelCache()
+    for room in range(1, ROOMS + 1):
+        for channel in range(1, CHANNELS_PER_ROOM + 1):
+            level_cache[RoomChannel(room, channel)] = LevelCacheItem(
+                0, room, channel, {scene: rnd.randint(0, 255) for scene in range(1, 18)}
+            )
+    return level_cache
+
+
+def _legacy_scene_update(bridge: RakoBridge, status_message: StatusMessage) -> None:
+    assert isinstance(status_message, SceneStatusMessage)
+    room = status_message.room
+    for channel, brightness in bridge.level_cache.get_channel_levels(
+        room, status_message.scene
+    ):
+        if channel_light := bridge._light_index.get((room, channel)):
+            bridge._pending_brightness[channel_light] = brightness
+    bridge._schedule_state_flush()
+
+
+def _legacy_state_update(bridge: RakoBridge, status_message: StatusMessage) -> None:
+    light_unique_id = create_unique_id(
+        bridge.mac, status_message.room, status_message.channel
+    )
+    brightness = 0
+    if isinstance(status_message, ChannelStatusMessage):
+        brightness = status_message.brightness
+    listening_light = bridge.get_listening_light(light_unique_id)
+    if listening_light:
+        listening_light.brightness = brightness
+
+
+def main() -> None:
+    """Run the benchmark and print messages per second for both paths."""
+    hass = SimpleNamespace(data={DOMAIN: {}})
+    bridge = RakoBridge("127.0.0.1", 9761, "bench", MAC, "bench", hass)
+    hass.data[DOMAIN][MAC] = {
+        "rako_bridge_client": bridge,
+        "rako_light_map": {},
+    }
+    for room in range(1, ROOMS + 1):
+        for channel in range(CHANNELS_PER_ROOM + 1):
+            bridge._add_listening_light(_BenchLight(room, channel))
+
+    stream = _recorded_stream(MESSAGES)
+    for label, dispatch in (
+        ("unique_id lookup", _legacy_state_update),
+        ("(room, channel) index", RakoBridge.async_dispatch_status),
+    ):
+        _run(label, bridge, dispatch, stream)
+
+    bridge._set_cache_state(_level_cache(), SceneCache())
+    stream = _scene_stream(SCENE_MESSAGES)
+    for label, dispatch in (
+        ("level cache scan", _legacy_scene_update),
+        ("scene table", RakoBridge.async_dispatch_status),
+    ):
+        _run(label, bridge, dispatch, stream)
+
+
+def _run(label: str, bridge: RakoBridge, dispatch, stream) -> None:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    for message in stream:
+        dispatch(bridge, message)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>24}: {len(stream) / elapsed:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Record the datagrams pushed by Rako bridges to a compact file.
+
+Each datagram is stored with its arrival time relative to the first one and
+its IPv4 source address, so ``bench_replay`` can play real traffic back at
+the recorded pace or any other rate.
+
+Run on the bridge's network, from the repository root::
+
+    python -m benchmarks.record rako.rec --duration 600
+
+Stop the integration first, or pass the port it doesn't listen on.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable, Iterator
+from ipaddress import IPv4Address
+import struct
+from typing import BinaryIO
+
+from python_rako.const import RAKO_BRIDGE_DEFAULT_PORT
+
+MAGIC = b"RAKOREC1"
+# seconds since the first datagram, IPv4 source, payload length
+_HEADER = struct.Struct("<dIH")
+
+Datagram = tuple[float, str, bytes]
+
+
+def write_datagram(file: BinaryIO, time: float, host: str, data: bytes) -> None:
+    """Append a datagram to a recording."""
+    file.write(_HEADER.pack(time, int(IPv4Address(host)), len(data)) + data)
+
+
+def write_recording(file: BinaryIO, datagrams: Iterable[Datagram]) -> None:
+    """Write a whole recording, e.g. a synthetic one."""
+    file.write(MAGIC)
+    for time, host, data in datagrams:
+        write_datagram(file, time, host, data)
+
+
+def read_recording(file: BinaryIO) -> Iterator[Datagram]:
+    """Yield the datagrams of a recording with their time and source."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a Rako datagram recording")
+    while header := file.read(_HEADER.size):
+        time, host, length = _HEADER.unpack(header)
+        yield time, str(IPv4Address(host)), file.read(length)
+
+
+class _RecordingProtocol(asyncio.DatagramProtocol):
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._start: float | None = None
+        self.count = 0
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._start is None:
+            self._start = now
+        write_datagram(self._file, now - self._start, addr[0], data)
+        self.count += 1
+
+
+async def record(path: str, port: int, duration: float) -> int:
+    """Record the datagrams received on port for duration seconds."""
+    loop = asyncio.get_running_loop()
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _RecordingProtocol(file), local_addr=("0.0.0.0", port)
+        )
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            transport.close()
+    return protocol.count
+
+
+def main() -> None:
+    """Record datagrams as configured on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="recording to write")
+    parser.add_argument("--port", type=int, default=RAKO_BRIDGE_DEFAULT_PORT)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    args = parser.parse_args()
+    count = asyncio.run(record(args.path, args.port, args.duration))
+    print(f"Recorded {count} datagrams to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
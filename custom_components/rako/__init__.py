@@ -1,23 +1,45 @@
 """The Rako integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+
+import aiohttp
 
-from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME, CONF_PORT
+from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME, CONF_PORT, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .bridge import RakoBridge
-from .const import DOMAIN
+from .const import (
+    CONF_COMMAND_INTERVAL,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_DEVICE_PER_ROOM,
+    CONF_MAX_IN_FLIGHT,
+    CONF_OPTIMISTIC,
+    CONF_STATE_FLUSH_WINDOW,
+    DEFAULT_COMMAND_INTERVAL,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_DEVICE_PER_ROOM,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_STATE_FLUSH_WINDOW,
+    DOMAIN,
+)
+from .devices import async_sync_devices
 from .model import RakoDomainEntryData
+from .storage import create_snapshot_store
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Rako from a config entry."""
+    start = time.monotonic()
     rako_bridge = RakoBridge(
         host=entry.data[CONF_HOST],
         port=entry.data[CONF_PORT],
@@ -25,6 +47,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         mac=entry.data[CONF_MAC],
         entry_id=entry.entry_id,
         hass=hass,
+        state_flush_window=entry.options.get(
+            CONF_STATE_FLUSH_WINDOW, DEFAULT_STATE_FLUSH_WINDOW
+        ),
+        max_in_flight=entry.options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+        command_interval=entry.options.get(
+            CONF_COMMAND_INTERVAL, DEFAULT_COMMAND_INTERVAL
+        ),
+        optimistic=entry.options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+        confirm_timeout=entry.options.get(
+            CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT
+        ),
+        device_per_room=entry.options.get(
+            CONF_DEVICE_PER_ROOM, DEFAULT_DEVICE_PER_ROOM
+        ),
     )
 
     device_registry = dr.async_get(hass)
@@ -40,23 +76,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     rako_domain_entry_data: RakoDomainEntryData = {
         "rako_bridge_client": rako_bridge,
         "rako_light_map": {},
-        "rako_listener_task": None,
+        "rako_switch_map": {},
+        "rako_platforms": [],
     }
     hass.data[DOMAIN][rako_bridge.mac] = rako_domain_entry_data
 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setup(entry, LIGHT_DOMAIN)
+    # the platforms share the fetched bridge configuration
+    session = async_get_clientsession(hass)
+    await rako_bridge.async_start_discovery(session)
+    discovery_started = time.monotonic()
+
+    try:
+        has_lights, has_switches = await rako_bridge.async_get_device_types(session)
+        await async_sync_devices(hass, rako_bridge, session)
+    except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as ex:
+        await rako_bridge.async_shutdown()
+        del hass.data[DOMAIN][rako_bridge.mac]
+        raise ConfigEntryNotReady(
+            f"Couldn't read the bridge configuration: {ex}"
+        ) from ex
+    topology_loaded = time.monotonic()
+
+    # only load the platform modules this bridge has entities for
+    platforms = [Platform.SENSOR]
+    if has_lights:
+        platforms += [Platform.LIGHT, Platform.SCENE, Platform.EVENT]
+    if has_switches:
+        platforms.append(Platform.SWITCH)
+    rako_domain_entry_data["rako_platforms"] = platforms
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    rako_bridge.async_start_refresh(session)
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    _LOGGER.debug(
+        "Set up Rako bridge %s in %.3fs: discovery %.3fs, topology %.3fs, "
+        "platforms %s %.3fs",
+        rako_bridge.mac,
+        time.monotonic() - start,
+        discovery_started - start,
+        topology_loaded - discovery_started,
+        platforms,
+        time.monotonic() - topology_loaded,
     )
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    await hass.config_entries.async_forward_entry_unload(entry, LIGHT_DOMAIN)
+    rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
+    if not await hass.config_entries.async_unload_platforms(
+        entry, rako_domain_entry_data["rako_platforms"]
+    ):
+        return False
+
+    await rako_domain_entry_data["rako_bridge_client"].async_shutdown()
 
     del hass.data[DOMAIN][entry.unique_id]
     if not hass.data[DOMAIN]:
         del hass.data[DOMAIN]
 
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a deleted config entry."""
+    await create_snapshot_store(hass, entry.data[CONF_MAC]).async_remove()
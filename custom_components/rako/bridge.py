@@ -3,21 +3,69 @@ from __future__ import annotations
 
 import asyncio
 from asyncio import Task
+from collections.abc import Awaitable, Callable
+from functools import partial
 import logging
+from typing import TYPE_CHECKING, Any
 
+import aiohttp
 from python_rako.bridge import Bridge
-from python_rako.helpers import convert_to_brightness, get_dg_listener
-from python_rako.model import ChannelStatusMessage, SceneStatusMessage, StatusMessage
+from python_rako.helpers import convert_to_brightness
+from python_rako.model import (
+    ChannelStatusMessage,
+    LevelCache,
+    LevelCacheItem,
+    SceneCache,
+    SceneStatusMessage,
+    StatusMessage,
+)
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
-from .light import RakoLight
+from .command_queue import RakoCommandQueue
+from .command_transport import RakoCommandTransport
+from .const import (
+    COMMAND_FAILURES_UNAVAILABLE,
+    COMMAND_RETRIES,
+    COMMAND_RETRY_DELAY,
+    DEFAULT_COMMAND_INTERVAL,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_DEVICE_PER_ROOM,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_STATE_FLUSH_WINDOW,
+    DOMAIN,
+    MESSAGE_RATE_WINDOW,
+    TRANSITION_TICK,
+)
+from .listener import RakoListener, async_get_listener
 from .model import RakoDomainEntryData
+from .stats import RakoHistogram
+from .storage import (
+    SNAPSHOT_SAVE_DELAY,
+    RakoSnapshot,
+    caches_from_snapshot,
+    create_config_hash,
+    create_snapshot_store,
+    snapshot_from_state,
+)
+from .transition import RakoTransitionScheduler
 from .util import create_unique_id
 
+if TYPE_CHECKING:
+    from .event import RakoRoomEvent
+    from .light import RakoLight
+    from .switch import RakoSwitch
+
 _LOGGER = logging.getLogger(__name__)
 
+# the lights and switches of a room with their level in one scene
+SceneLevels = tuple[
+    tuple[tuple["RakoLight", int], ...], tuple[tuple["RakoSwitch", bool], ...]
+]
+
 
 class RakoBridge(Bridge):
     """Represents a Rako Bridge."""
@@ -30,26 +78,368 @@ class RakoBridge(Bridge):
         mac: str,
         entry_id: str,
         hass: HomeAssistant,
+        state_flush_window: float = DEFAULT_STATE_FLUSH_WINDOW,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        command_interval: float = DEFAULT_COMMAND_INTERVAL,
+        optimistic: bool = DEFAULT_OPTIMISTIC,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+        device_per_room: bool = DEFAULT_DEVICE_PER_ROOM,
     ) -> None:
         """Init subclass of python_rako Bridge."""
-        super().__init__(host, port, name, mac)
+        self.command_transport = RakoCommandTransport(host, port)
+        super().__init__(host, port, name, mac, self.command_transport)
         self.entry_id = entry_id
         self.hass = hass
+        self.state_flush_window = state_flush_window
+        self.optimistic = optimistic
+        self.confirm_timeout = confirm_timeout
+        self.optimistic_rollbacks = 0
+        self.device_per_room = device_per_room
+        self.topology_hash: str | None = None
+        self._light_index: dict[tuple[int, int], RakoLight] = {}
+        self._switch_index: dict[tuple[int, int], RakoSwitch] = {}
+        self._event_index: dict[int, RakoRoomEvent] = {}
+        self._pending_brightness: dict[RakoLight, int] = {}
+        self._room_levels: dict[int, list[LevelCacheItem]] = {}
+        self._scene_table: dict[int, dict[int, SceneLevels]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.suppressed_state_writes = 0
+        self._cache_state_task: asyncio.Future[
+            tuple[LevelCache, SceneCache]
+        ] | None = None
+        self._rako_xml_task: asyncio.Future[str] | None = None
+        self._rako_xml: str | None = None
+        self._snapshot_store = create_snapshot_store(hass, mac)
+        self._refresh_task: Task | None = None
+        self._snapshot: RakoSnapshot | None = None
+        self._resync_task: Task | None = None
+        self.resyncs = 0
+        self._listener: RakoListener | None = None
+        self.listener_connected = True
+        self.listener_restarts = 0
+        self.messages_received = 0
+        self.last_message_time: float | None = None
+        self.message_rate = 0.0
+        self.unmatched_messages = 0
+        self.dispatch_latency = RakoHistogram()
+        self._rate_window_start = 0.0
+        self._rate_window_count = 0
+        self.command_queue = RakoCommandQueue(
+            hass,
+            max_in_flight,
+            command_interval,
+            DEFAULT_COMMAND_TIMEOUT,
+            room_batcher=self._room_batch_command,
+            retries=COMMAND_RETRIES,
+            retry_delay=COMMAND_RETRY_DELAY,
+            recovered=self._async_commands_recovered,
+        )
+        self.transitions = RakoTransitionScheduler(hass, self, TRANSITION_TICK)
 
-    @property
-    def _light_map(self) -> dict[str, RakoLight]:
-        rako_domain_entry_data: RakoDomainEntryData = self.hass.data[DOMAIN][self.mac]
-        return rako_domain_entry_data["rako_light_map"]
+    async def async_start_discovery(self, session: aiohttp.ClientSession) -> None:
+        """Start discovery from the stored snapshot, or from the bridge.
+
+        With a snapshot the platforms set up from it immediately and the bridge
+        is revalidated in the background once set up, see
+        async_start_refresh. Otherwise the level cache and bridge configuration
+        are fetched concurrently.
+        """
+        snapshot = await self._snapshot_store.async_load()
+        if snapshot is None:
+            self._cache_state_task = asyncio.create_task(
+                self.get_cache_state(), name=f"rako_{self.mac}_cache_state"
+            )
+            self._rako_xml_task = asyncio.create_task(
+                super().get_rako_xml(session), name=f"rako_{self.mac}_rako_xml"
+            )
+        else:
+            self._rako_xml = snapshot["rako_xml"]
+            self.topology_hash = snapshot.get("topology_hash")
+            self._rako_xml_task = self.hass.loop.create_future()
+            self._rako_xml_task.set_result(snapshot["rako_xml"])
+            self._cache_state_task = self.hass.loop.create_future()
+            self._cache_state_task.set_result(caches_from_snapshot(snapshot))
+        self._snapshot = snapshot
+
+    @callback
+    def async_start_refresh(self, session: aiohttp.ClientSession) -> None:
+        """Store the fetched state or revalidate the snapshot in the background.
+
+        Called once the platforms are set up, as a changed configuration
+        reloads the config entry.
+        """
+        self._refresh_task = asyncio.create_task(
+            self._async_refresh_snapshot(session, self._snapshot),
+            name=f"rako_{self.mac}_refresh_snapshot",
+        )
+
+    async def _async_refresh_snapshot(
+        self, session: aiohttp.ClientSession, snapshot: RakoSnapshot | None
+    ) -> None:
+        """Store the fetched bridge state, or revalidate the stored snapshot."""
+        assert self._rako_xml_task and self._cache_state_task
+        try:
+            if snapshot is None:
+                rako_xml = await self._rako_xml_task
+                level_cache, scene_cache = await self._cache_state_task
+            else:
+                rako_xml, (level_cache, scene_cache) = await asyncio.gather(
+                    super().get_rako_xml(session), self.get_cache_state()
+                )
+        except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as ex:
+            _LOGGER.warning("Couldn't refresh Rako bridge %s: %s", self.mac, ex)
+            return
+        if not level_cache:
+            # python_rako returns empty caches when the bridge doesn't answer
+            _LOGGER.warning("Couldn't refresh Rako bridge %s: no levels", self.mac)
+            return
+
+        self._rako_xml = rako_xml
+        await self._snapshot_store.async_save(
+            snapshot_from_state(rako_xml, level_cache, scene_cache, self.topology_hash)
+        )
+        if snapshot is None:
+            return
+
+        if snapshot["config_hash"] != create_config_hash(rako_xml):
+            entry = self.hass.config_entries.async_get_entry(self.entry_id)
+            if entry is None or entry.state is not ConfigEntryState.LOADED:
+                # not set up or unloading, the next setup sees the new snapshot
+                return
+            _LOGGER.info("Rako bridge %s configuration changed, reloading", self.mac)
+            self.hass.async_create_task(
+                self.hass.config_entries.async_reload(self.entry_id)
+            )
+            return
+        self.async_apply_cache_state(level_cache, scene_cache)
+
+    @callback
+    def async_apply_cache_state(
+        self, level_cache: LevelCache, scene_cache: SceneCache
+    ) -> None:
+        """Replace the caches and push any resulting brightness change."""
+        self._set_cache_state(level_cache, scene_cache)
+        # platforms still to load the caches get these, not an older snapshot
+        self._cache_state_task = self.hass.loop.create_future()
+        self._cache_state_task.set_result((level_cache, scene_cache))
+        for light in self._light_index.values():
+            brightness = light.get_brightness_from_cache()
+            if light.brightness != brightness:
+                self._pending_brightness[light] = brightness
+        self._schedule_state_flush()
+        if self._rako_xml is not None:
+            self._snapshot_store.async_delay_save(
+                self._snapshot_data, SNAPSHOT_SAVE_DELAY
+            )
+
+    @callback
+    def async_request_resync(self) -> None:
+        """Refresh the caches from the bridge once, e.g. after a listener gap."""
+        if self._resync_task and not self._resync_task.done():
+            return
+        self._resync_task = asyncio.create_task(
+            self._async_resync(), name=f"rako_{self.mac}_resync"
+        )
+
+    async def _async_resync(self) -> None:
+        _LOGGER.debug("Resyncing Rako bridge %s", self.mac)
+        try:
+            level_cache, scene_cache = await self.get_cache_state()
+        except OSError as ex:
+            _LOGGER.warning("Couldn't resync Rako bridge %s: %s", self.mac, ex)
+            return
+        if not level_cache:
+            _LOGGER.warning("Couldn't resync Rako bridge %s: no levels", self.mac)
+            return
+        self.resyncs += 1
+        self.async_apply_cache_state(level_cache, scene_cache)
+
+    @callback
+    def _snapshot_data(self) -> RakoSnapshot:
+        assert self._rako_xml is not None
+        return snapshot_from_state(
+            self._rako_xml, self.level_cache, self.scene_cache, self.topology_hash
+        )
+
+    @callback
+    def async_set_topology_hash(self, topology_hash: str) -> None:
+        """Remember the devices written to the registry in the stored snapshot."""
+        self.topology_hash = topology_hash
+        if self._rako_xml is not None:
+            self._snapshot_store.async_delay_save(
+                self._snapshot_data, SNAPSHOT_SAVE_DELAY
+            )
+
+    def get_device_unique_id(self, room_id: int, channel_id: int) -> str:
+        """Return the unique ID of the device a room's channel belongs to."""
+        if self.device_per_room:
+            channel_id = 0
+        return create_unique_id(self.mac, room_id, channel_id)
+
+    @callback
+    def async_dispatch_status(self, status_message: StatusMessage) -> None:
+        """Dispatch a status message pushed by the bridge to our entities."""
+        # hot path: tuple lookups only, no unique ID formatting per datagram
+        room = status_message.room
+        brightness = 0
+        if isinstance(status_message, ChannelStatusMessage):
+            brightness = status_message.brightness
+        elif isinstance(status_message, SceneStatusMessage):
+            self.async_apply_room_scene(room, status_message.scene)
+            brightness = convert_to_brightness(status_message.scene)
+
+        key = (room, status_message.channel)
+        matched = True
+        if listening_light := self._light_index.get(key):
+            if self.state_flush_window > 0:
+                self._pending_brightness[listening_light] = brightness
+            else:
+                # nothing to coalesce, only scene fan-out is staged
+                listening_light.brightness = brightness
+        elif listening_switch := self._switch_index.get(key):
+            listening_switch.is_on = brightness > 0
+        else:
+            matched = False
+            self.unmatched_messages += 1
+            _LOGGER.debug("Light not listening: %s", status_message)
+
+        # only rooms with an enabled event entity publish events
+        if room_event := self._event_index.get(room):
+            room_event.async_status_received(status_message, matched)
+
+        if self._pending_brightness:
+            self._schedule_state_flush()
+
+    @callback
+    def async_apply_room_scene(self, room_id: int, scene: int) -> None:
+        """Stage the levels a room scene sets on our channel entities."""
+        if room_scenes := self._scene_table.get(room_id):
+            pending = self._pending_brightness
+            scene_lights, scene_switches = room_scenes.get(scene, room_scenes[0])
+            for scene_light, level in scene_lights:
+                pending[scene_light] = level
+            for scene_switch, is_on in scene_switches:
+                scene_switch.is_on = is_on
+        self.async_scene_changed(room_id, scene)
+
+    def get_room_scenes(self, room_id: int) -> list[int]:
+        """Return the scenes of a room that light any channel, after scene 0."""
+        room_levels = self._room_levels.get(room_id, ())
+        scenes = {
+            scene
+            for lci in room_levels
+            for scene, level in lci.scene_levels.items()
+            if level
+        }
+        return [0, *sorted(scenes)]
+
+    @callback
+    def async_scene_changed(self, room_id: int, scene: int) -> None:
+        """Track the current scene of a room for the stored snapshot."""
+        if self.scene_cache.get(room_id) == scene:
+            return
+        self.scene_cache[room_id] = scene
+        if self._rako_xml is not None:
+            self._snapshot_store.async_delay_save(
+                self._snapshot_data, SNAPSHOT_SAVE_DELAY
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop background work of the bridge."""
+        for task in (self._refresh_task, self._resync_task):
+            if task:
+                task.cancel()
+        self.transitions.shutdown()
+        self.command_queue.shutdown()
+        self.command_transport.close()
+
+    async def async_load_cache_state(self) -> None:
+        """Load the level and scene caches, waiting for a fetch in progress."""
+        if self._cache_state_task is None:
+            self._cache_state_task = asyncio.create_task(self.get_cache_state())
+        level_cache, scene_cache = await self._cache_state_task
+        if level_cache is not self.level_cache:
+            self._set_cache_state(level_cache, scene_cache)
+
+    def _set_cache_state(
+        self, level_cache: LevelCache, scene_cache: SceneCache
+    ) -> None:
+        self.level_cache, self.scene_cache = level_cache, scene_cache
+        self._room_levels = {}
+        for lci in level_cache.values():
+            self._room_levels.setdefault(lci.room, []).append(lci)
+        self._scene_table = {}
+        for room_id in self._room_levels:
+            self._build_room_scene_table(room_id)
+
+    def _build_room_scene_table(self, room_id: int) -> None:
+        """Precompute the levels each scene of a room sets on our entities.
+
+        Scene status messages are fanned out from this table, which holds the
+        entities themselves so recalling a scene needs no lookups. Scenes
+        missing from the table set every channel to 0, like scene 0.
+        """
+        room_levels = self._room_levels.get(room_id)
+        if not room_levels:
+            self._scene_table.pop(room_id, None)
+            return
+        lights: list[tuple[RakoLight, LevelCacheItem]] = []
+        switches: list[tuple[RakoSwitch, LevelCacheItem]] = []
+        for lci in room_levels:
+            if light := self._light_index.get((room_id, lci.channel)):
+                lights.append((light, lci))
+            elif switch := self._switch_index.get((room_id, lci.channel)):
+                switches.append((switch, lci))
+
+        scenes = {0}.union(*(lci.scene_levels for lci in room_levels))
+        self._scene_table[room_id] = {
+            scene: (
+                tuple((light, lci.scene_levels.get(scene, 0)) for light, lci in lights),
+                tuple(
+                    (switch, lci.scene_levels.get(scene, 0) > 0)
+                    for switch, lci in switches
+                ),
+            )
+            for scene in scenes
+        }
+
+    async def async_get_device_types(
+        self, session: aiohttp.ClientSession
+    ) -> tuple[bool, bool]:
+        """Return whether the bridge configuration has lights and switches."""
+        rako_xml = await self.get_rako_xml(session)
+        has_lights = (
+            next(self.get_lights_from_discovery_xml(rako_xml), None) is not None
+        )
+        has_switches = False
+        if self.supports_switches:
+            async for _switch in self.discover_switches(session):
+                has_switches = True
+                break
+        return has_lights, has_switches
 
     @property
-    def _listener_task(self) -> Task | None:
-        rako_domain_entry_data: RakoDomainEntryData = self.hass.data[DOMAIN][self.mac]
-        return rako_domain_entry_data["rako_listener_task"]
+    def supports_switches(self) -> bool:
+        """Return True if the installed python_rako can discover and set switches.
+
+        Only some python_rako releases have switch support, without it the
+        bridge is set up with its lights only.
+        """
+        return all(
+            hasattr(self, method)
+            for method in ("discover_switches", "turn_on_switch", "turn_off_switch")
+        )
+
+    async def get_rako_xml(self, session: aiohttp.ClientSession) -> str:
+        """Return the bridge configuration, shared by light and switch discovery."""
+        if self._rako_xml_task is None:
+            self._rako_xml_task = asyncio.create_task(super().get_rako_xml(session))
+        return await self._rako_xml_task
 
-    @_listener_task.setter
-    def _listener_task(self, task: Task) -> None:
+    @property
+    def _light_map(self) -> dict[str, RakoLight]:
         rako_domain_entry_data: RakoDomainEntryData = self.hass.data[DOMAIN][self.mac]
-        rako_domain_entry_data["rako_listener_task"] = task
+        return rako_domain_entry_data["rako_light_map"]
 
     def get_listening_light(self, light_unique_id: str) -> RakoLight | None:
         """Return the Light, if listening."""
@@ -59,66 +449,271 @@ class RakoBridge(Bridge):
     def _add_listening_light(self, light: RakoLight) -> None:
         light_map = self._light_map
         light_map[light.unique_id] = light
+        self._light_index[(light.room_id, light.channel_id)] = light
+        self._build_room_scene_table(light.room_id)
 
     def _remove_listening_light(self, light: RakoLight) -> None:
         light_map = self._light_map
         if light.unique_id in light_map:
             del light_map[light.unique_id]
+        self._light_index.pop((light.room_id, light.channel_id), None)
+        self._pending_brightness.pop(light, None)
+        self._build_room_scene_table(light.room_id)
 
-    async def listen_for_state_updates(self) -> None:
-        """Background task to listen for state updates."""
-        self._listener_task: Task = asyncio.create_task(
-            listen_for_state_updates(self), name=f"rako_{self.mac}_listener_task"
+    @property
+    def _switch_map(self) -> dict[str, RakoSwitch]:
+        rako_domain_entry_data: RakoDomainEntryData = self.hass.data[DOMAIN][self.mac]
+        return rako_domain_entry_data["rako_switch_map"]
+
+    def _add_listening_switch(self, switch: RakoSwitch) -> None:
+        switch_map = self._switch_map
+        switch_map[switch.unique_id] = switch
+        self._switch_index[(switch.room_id, switch.channel_id)] = switch
+        self._build_room_scene_table(switch.room_id)
+
+    def _remove_listening_switch(self, switch: RakoSwitch) -> None:
+        switch_map = self._switch_map
+        if switch.unique_id in switch_map:
+            del switch_map[switch.unique_id]
+        self._switch_index.pop((switch.room_id, switch.channel_id), None)
+        self._build_room_scene_table(switch.room_id)
+
+    @property
+    def _listening_entities(self) -> int:
+        return len(self._light_index) + len(self._switch_index) + len(self._event_index)
+
+    def _schedule_state_flush(self) -> None:
+        """Flush pending brightness now, or once the flush window elapses."""
+        if not self._pending_brightness or self._flush_handle:
+            return
+        if self.state_flush_window <= 0:
+            self._flush_state_updates()
+            return
+        self._flush_handle = self.hass.loop.call_later(
+            self.state_flush_window, self._flush_state_updates
         )
 
+    @callback
+    def _flush_state_updates(self) -> None:
+        """Write all coalesced brightness changes to HA in one pass."""
+        self._flush_handle = None
+        pending = self._pending_brightness
+        # emptied in place, a write may stage another light while we flush
+        while pending:
+            light, brightness = pending.popitem()
+            # no-op repeats are suppressed and counted by the entity
+            light.brightness = brightness
+
+    def _cancel_state_flush(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_brightness.clear()
+
+    async def async_queue_channel_brightness(
+        self, room_id: int, channel_id: int, brightness: int
+    ) -> None:
+        """Queue a channel brightness command, superseding any still queued."""
+        await self.command_queue.async_send(
+            room_id,
+            channel_id,
+            partial(self.set_channel_brightness, room_id, channel_id, brightness),
+            level=brightness,
+        )
+
+    async def async_queue_room_scene(self, room_id: int, scene: int) -> None:
+        """Queue a room scene command, superseding any still queued."""
+        await self.command_queue.async_send(
+            room_id, 0, partial(self.set_room_scene, room_id, scene)
+        )
+
+    async def async_queue_switch(self, room_id: int, channel_id: int, on: bool) -> None:
+        """Queue a switch command, superseding any still queued."""
+        send = self.turn_on_switch if on else self.turn_off_switch
+        await self.command_queue.async_send(
+            room_id, channel_id, partial(send, room_id, channel_id)
+        )
+
+    @property
+    def commands_failing(self) -> bool:
+        """Return True once consecutive commands failed despite their retries."""
+        return self.command_queue.consecutive_failures >= COMMAND_FAILURES_UNAVAILABLE
+
+    @callback
+    def _async_commands_recovered(self) -> None:
+        """Make the entities available again once a command gets through.
+
+        HA doesn't call services of unavailable entities, so they can't
+        recover through their own commands.
+        """
+        if not self.listener_connected:
+            return
+        for light in self._light_index.values():
+            light.available = True
+        for switch in self._switch_index.values():
+            switch.available = True
+
+    async def async_activate_room_scene(self, room_id: int, scene: int) -> None:
+        """Recall a room scene, updating its channels without waiting for echoes."""
+        await self.async_queue_room_scene(room_id, scene)
+        self.async_apply_room_scene(room_id, scene)
+        if room_light := self._light_index.get((room_id, 0)):
+            self._pending_brightness[room_light] = convert_to_brightness(scene)
+        self._schedule_state_flush()
+
+    def _room_batch_command(
+        self, room_id: int, levels: dict[int, int]
+    ) -> tuple[Callable[[], Awaitable[None]], int]:
+        """Return a command setting several channels of one room, and its frames."""
+        scene = self._match_room_scene(room_id, levels)
+        if scene is not None:
+            _LOGGER.debug(
+                "Channel levels %s match room %s scene %s", levels, room_id, scene
+            )
+            return partial(self.set_room_scene, room_id, scene), 1
+        return partial(self._async_send_channel_levels, room_id, levels), len(levels)
+
+    def _match_room_scene(self, room_id: int, levels: dict[int, int]) -> int | None:
+        """Return the scene of the room resulting in these channel levels, if any."""
+        scene_levels: dict[int, dict[int, int]] = {}
+        room_levels: dict[int, int] = {}
+        for lci in self._room_levels.get(room_id, ()):
+            scene_levels[lci.channel] = lci.scene_levels
+            if lci.channel in levels:
+                room_levels[lci.channel] = levels[lci.channel]
+            elif light := self._light_index.get((room_id, lci.channel)):
+                room_levels[lci.channel] = light.brightness
+            else:
+                return None
+        if not room_levels or not levels.keys() <= room_levels.keys():
+            return None
+
+        if not any(room_levels.values()):
+            return 0
+        scenes = set.intersection(
+            *(set(scene_levels[channel]) for channel in room_levels)
+        )
+        for scene in sorted(scenes):
+            if all(
+                scene_levels[channel][scene] == level
+                for channel, level in room_levels.items()
+            ):
+                return scene
+        return None
+
+    async def _async_send_channel_levels(
+        self, room_id: int, levels: dict[int, int]
+    ) -> None:
+        """Send channel levels of one room back to back."""
+        for channel_id, brightness in levels.items():
+            await self.set_channel_brightness(room_id, channel_id, brightness)
+
+    @callback
+    def async_message_received(self) -> None:
+        """Track listener health for a received datagram."""
+        now = self.hass.loop.time()
+        self.messages_received += 1
+        self.last_message_time = now
+        self._rate_window_count += 1
+        elapsed = now - self._rate_window_start
+        if elapsed >= MESSAGE_RATE_WINDOW:
+            self.message_rate = self._rate_window_count / elapsed
+            self._rate_window_start = now
+            self._rate_window_count = 0
+
+    @callback
+    def get_message_rate(self) -> float:
+        """Return the received messages per second, 0 after a silence."""
+        if (
+            self.last_message_time is None
+            or self.hass.loop.time() - self.last_message_time > 2 * MESSAGE_RATE_WINDOW
+        ):
+            return 0.0
+        return self.message_rate
+
+    @callback
+    def get_stats(self) -> dict[str, Any]:
+        """Return the bridge's performance counters and histograms."""
+        queue = self.command_queue
+        return {
+            "listener_connected": self.listener_connected,
+            "listener_restarts": self.listener_restarts,
+            "messages_received": self.messages_received,
+            "message_rate": self.get_message_rate(),
+            "unmatched_messages": self.unmatched_messages,
+            "dispatch_latency": self.dispatch_latency.as_dict(),
+            "suppressed_state_writes": self.suppressed_state_writes,
+            "resyncs": self.resyncs,
+            "optimistic_rollbacks": self.optimistic_rollbacks,
+            "command_rtt": queue.command_rtt.as_dict(),
+            "command_timeouts": queue.command_timeouts,
+            "command_retries": queue.command_retries,
+            "command_timeout": queue.rtt.timeout,
+            "smoothed_rtt": queue.rtt.srtt,
+            "superseded_commands": queue.superseded_commands,
+            "batched_commands": queue.batched_commands,
+            "command_sockets_opened": self.command_transport.sockets_opened,
+        }
+
+    @callback
+    def async_set_listener_connected(self, connected: bool) -> None:
+        """Flip the availability of all entities when the listener goes down or up."""
+        if self.listener_connected == connected:
+            return
+        self.listener_connected = connected
+        _LOGGER.debug("Rako bridge %s listener connected: %s", self.mac, connected)
+        for light in self._light_index.values():
+            light.available = connected
+        for switch in self._switch_index.values():
+            switch.available = connected
+        if connected:
+            # anything pushed while we weren't listening is lost
+            self.async_request_resync()
+
+    async def listen_for_state_updates(self) -> None:
+        """Start receiving state updates through the listener on our port."""
+        self._listener = async_get_listener(self.hass, self.port)
+        self._listener.async_add_bridge(self)
+
     async def stop_listening_for_state_updates(self) -> None:
-        """Background task to stop listening for state updates."""
-        if listener_task := self._listener_task:
-            listener_task.cancel()
-            try:
-                await listener_task
-            except asyncio.CancelledError:
-                pass
+        """Stop receiving state updates."""
+        if listener := self._listener:
+            self._listener = None
+            await listener.async_remove_bridge(self)
+        self._cancel_state_flush()
 
     async def register_for_state_updates(self, light: RakoLight) -> None:
         """Register a light to listen for state updates."""
         self._add_listening_light(light)
-        if len(self._light_map) == 1:
+        if self._listening_entities == 1:
             await self.listen_for_state_updates()
 
     async def deregister_for_state_updates(self, light: RakoLight) -> None:
         """Deregister a light to listen for state updates."""
         self._remove_listening_light(light)
-        if not self._light_map:
+        if not self._listening_entities:
             await self.stop_listening_for_state_updates()
 
+    async def register_switch_for_state_updates(self, switch: RakoSwitch) -> None:
+        """Register a switch to listen for state updates."""
+        self._add_listening_switch(switch)
+        if self._listening_entities == 1:
+            await self.listen_for_state_updates()
 
-def _state_update(bridge: RakoBridge, status_message: StatusMessage) -> None:
-    light_unique_id = create_unique_id(
-        bridge.mac, status_message.room, status_message.channel
-    )
-    brightness = 0
-    if isinstance(status_message, ChannelStatusMessage):
-        brightness = status_message.brightness
-    elif isinstance(status_message, SceneStatusMessage):
-        for _channel, _brightness in bridge.level_cache.get_channel_levels(
-            status_message.room, status_message.scene
-        ):
-            _msg = ChannelStatusMessage(status_message.room, _channel, _brightness)
-            _state_update(bridge, _msg)
-        brightness = convert_to_brightness(status_message.scene)
-
-    listening_light = bridge.get_listening_light(light_unique_id)
-    if listening_light:
-        listening_light.brightness = brightness
-    else:
-        _LOGGER.debug("Light not listening: %s", status_message)
-
-
-async def listen_for_state_updates(bridge: RakoBridge) -> None:
-    """Listen for state updates worker method."""
-    async with get_dg_listener(bridge.port) as listener:
-        while True:
-            message = await bridge.next_pushed_message(listener)
-            if message and isinstance(message, StatusMessage):
-                _state_update(bridge, message)
+    async def deregister_switch_for_state_updates(self, switch: RakoSwitch) -> None:
+        """Deregister a switch to listen for state updates."""
+        self._remove_listening_switch(switch)
+        if not self._listening_entities:
+            await self.stop_listening_for_state_updates()
+
+    async def register_event_for_state_updates(self, event: RakoRoomEvent) -> None:
+        """Register a room event entity for the room's status messages."""
+        self._event_index[event.room_id] = event
+        if self._listening_entities == 1:
+            await self.listen_for_state_updates()
+
+    async def deregister_event_for_state_updates(self, event: RakoRoomEvent) -> None:
+        """Deregister a room event entity."""
+        self._event_index.pop(event.room_id, None)
+        if not self._listening_entities:
+            await self.stop_listening_for_state_updates()
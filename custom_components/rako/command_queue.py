@@ -0,0 +1,254 @@
+"""Outbound command scheduling for a Rako Bridge."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import logging
+import random
+
+from python_rako.exceptions import RakoBridgeError
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import COMMAND_TIMEOUT_MAX, COMMAND_TIMEOUT_MIN, COMMAND_TOTAL_TIMEOUT
+from .stats import RakoHistogram, RakoRttEstimator
+
+_LOGGER = logging.getLogger(__name__)
+
+SendCommand = Callable[[], Awaitable[None]]
+# the command setting a room's channel levels, and how many frames it sends
+RoomBatcher = Callable[[int, dict[int, int]], tuple[SendCommand, int]]
+
+
+@dataclass
+class _QueuedCommand:
+    """A command waiting to be sent, shared by every caller it superseded."""
+
+    send: SendCommand
+    level: int | None = None
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+    # round trips made by send, one unless a room batch sends several
+    frames: int = 1
+
+
+class RakoCommandQueue:
+    """Per-bridge outbound command scheduler.
+
+    Only the latest command per (room, channel) is kept while an earlier one
+    is waiting or in flight, at most ``max_in_flight`` commands are sent
+    concurrently and consecutive sends are spaced by ``command_interval``.
+
+    Channel level commands queued together for the same room, e.g. by an area
+    or light group service call, are handed to ``room_batcher`` and sent as a
+    single command.
+
+    Commands only ever set absolute levels or scenes, so a command that timed
+    out or failed is retried up to ``retries`` times with a jittered
+    exponential delay. The timeout of each attempt follows the measured
+    round trip time of the bridge, per frame for a batch sending several, and
+    only single frame commands are sampled as round trips. ``recovered`` is
+    called when a command gets through after failed ones.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_in_flight: int,
+        command_interval: float,
+        timeout: float,
+        room_batcher: RoomBatcher | None = None,
+        retries: int = 0,
+        retry_delay: float = 0.0,
+        recovered: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the command queue, timing out after timeout until measured."""
+        self.hass = hass
+        self.max_in_flight = max_in_flight
+        self.command_interval = command_interval
+        self.room_batcher = room_batcher
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.recovered = recovered
+        self.rtt = RakoRttEstimator(timeout, COMMAND_TIMEOUT_MIN, COMMAND_TIMEOUT_MAX)
+        self.superseded_commands = 0
+        self.batched_commands = 0
+        self.command_timeouts = 0
+        self.command_retries = 0
+        self.consecutive_failures = 0
+        self.command_rtt = RakoHistogram()
+        self._queued: dict[tuple[int, int], _QueuedCommand] = {}
+        self._in_flight: set[tuple[int, int]] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._next_send = 0.0
+        self._pump_handle: asyncio.Handle | None = None
+
+    async def async_send(
+        self,
+        room_id: int,
+        channel_id: int,
+        send: SendCommand,
+        level: int | None = None,
+    ) -> None:
+        """Queue a command and wait until it, or a command superseding it, is sent.
+
+        ``level`` is the target of a channel level command and makes it
+        eligible for room batching. Raises whatever the last attempt of the
+        command that was finally sent raised, including asyncio.TimeoutError if
+        the bridge did not answer in time.
+        """
+        key = (room_id, channel_id)
+        waiter: asyncio.Future[None] = self.hass.loop.create_future()
+        if queued := self._queued.get(key):
+            _LOGGER.debug("Superseding queued command for %s", key)
+            queued.send = send
+            queued.level = level
+            self.superseded_commands += 1
+        else:
+            queued = self._queued[key] = _QueuedCommand(send, level)
+        queued.waiters.append(waiter)
+        if not self._pump_handle:
+            # let concurrent service calls queue up before anything is sent
+            self._pump_handle = self.hass.loop.call_soon(self._pump_later)
+        await waiter
+
+    @callback
+    def _pump(self) -> None:
+        """Start as many queued commands as the in-flight and rate limits allow."""
+        if self._pump_handle:
+            return
+        loop = self.hass.loop
+        while len(self._in_flight) < self.max_in_flight:
+            key = next((k for k in self._queued if k not in self._in_flight), None)
+            if key is None:
+                return
+            delay = self._next_send - loop.time()
+            if delay > 0:
+                self._pump_handle = loop.call_later(delay, self._pump_later)
+                return
+            self._next_send = loop.time() + self.command_interval
+            keys, command = self._pop_command(key)
+            self._in_flight.update(keys)
+            task = asyncio.create_task(self._async_run(keys, command))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _pop_command(
+        self, key: tuple[int, int]
+    ) -> tuple[list[tuple[int, int]], _QueuedCommand]:
+        """Pop a queued command, merged with level commands for the same room."""
+        command = self._queued.pop(key)
+        keys = [key]
+        if command.level is None or self.room_batcher is None:
+            return keys, command
+
+        room_id = key[0]
+        levels = {key[1]: command.level}
+        waiters = command.waiters
+        for other_key in [
+            k
+            for k, c in self._queued.items()
+            if k[0] == room_id and c.level is not None and k not in self._in_flight
+        ]:
+            other = self._queued.pop(other_key)
+            levels[other_key[1]] = other.level  # type: ignore[assignment]
+            waiters.extend(other.waiters)
+            keys.append(other_key)
+
+        if len(keys) == 1:
+            return keys, command
+        _LOGGER.debug("Batching %s level commands for room %s", len(keys), room_id)
+        self.batched_commands += len(keys) - 1
+        send, frames = self.room_batcher(room_id, levels)
+        return keys, _QueuedCommand(send, None, waiters, frames)
+
+    @callback
+    def _pump_later(self) -> None:
+        self._pump_handle = None
+        self._pump()
+
+    async def _async_run(
+        self, keys: list[tuple[int, int]], command: _QueuedCommand
+    ) -> None:
+        try:
+            if not await self._async_send_with_retries(keys, command):
+                return
+        except asyncio.CancelledError:
+            for waiter in command.waiters:
+                waiter.cancel()
+            raise
+        except Exception as ex:  # pylint: disable=broad-except
+            self.consecutive_failures += 1
+            for waiter in command.waiters:
+                if not waiter.done():
+                    waiter.set_exception(ex)
+        else:
+            if self.consecutive_failures and self.recovered:
+                self.recovered()
+            self.consecutive_failures = 0
+            for waiter in command.waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        finally:
+            self._in_flight.difference_update(keys)
+            self._pump()
+
+    async def _async_send_with_retries(
+        self, keys: list[tuple[int, int]], command: _QueuedCommand
+    ) -> bool:
+        """Send a command, retrying it. Return False if superseded meanwhile.
+
+        The timeout doubles on every attempt of this command, starting again
+        from the estimate for the next one, and all attempts together take at
+        most ``COMMAND_TOTAL_TIMEOUT`` per frame.
+        """
+        loop = self.hass.loop
+        deadline = loop.time() + COMMAND_TOTAL_TIMEOUT * command.frames
+        timeout = self.rtt.timeout
+        attempt = 0
+        while True:
+            start = loop.time()
+            try:
+                await asyncio.wait_for(
+                    command.send(),
+                    timeout=min(timeout * command.frames, deadline - start),
+                )
+            except asyncio.TimeoutError:
+                self.command_timeouts += 1
+                timeout = min(timeout * 2, COMMAND_TIMEOUT_MAX)
+                if attempt >= self.retries:
+                    raise
+            except (RakoBridgeError, OSError):
+                if attempt >= self.retries:
+                    raise
+            else:
+                if command.frames == 1:
+                    rtt = loop.time() - start
+                    self.rtt.add(rtt)
+                    self.command_rtt.add(rtt)
+                return True
+
+            if all(key in self._queued for key in keys):
+                # a newer command replaces this one, it also answers our callers
+                self._queued[keys[0]].waiters.extend(command.waiters)
+                return False
+            delay = self.retry_delay * 2**attempt * random.uniform(0.5, 1.5)
+            if loop.time() + delay >= deadline:
+                raise asyncio.TimeoutError
+            attempt += 1
+            self.command_retries += 1
+            _LOGGER.debug("Retrying command for %s in %.2fs", keys, delay)
+            await asyncio.sleep(delay)
+
+    @callback
+    def shutdown(self) -> None:
+        """Cancel queued and in-flight commands."""
+        if self._pump_handle:
+            self._pump_handle.cancel()
+            self._pump_handle = None
+        for command in self._queued.values():
+            for waiter in command.waiters:
+                waiter.cancel()
+        self._queued.clear()
+        for task in self._tasks:
+            task.cancel()
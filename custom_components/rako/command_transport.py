@@ -0,0 +1,105 @@
+"""Long-lived command transport for a Rako Bridge."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+import logging
+
+from python_rako.bridge import BridgeCommanderUDP
+from python_rako.const import COMMAND_SUCCESS_RESPONSE
+from python_rako.exceptions import RakoBridgeError
+from python_rako.helpers import command_to_byte_list
+from python_rako.model import CommandUDP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _CommandProtocol(asyncio.DatagramProtocol):
+    """Hand each response of the bridge to the oldest waiting command."""
+
+    def __init__(self, responses: deque[asyncio.Future[bytes]]) -> None:
+        self._responses = responses
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        while self._responses:
+            waiter = self._responses.popleft()
+            if not waiter.done():
+                waiter.set_result(data)
+                return
+        _LOGGER.debug("Rako bridge response without a command: %s", data)
+
+    def error_received(self, exc: Exception) -> None:
+        while self._responses:
+            waiter = self._responses.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+                return
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        while self._responses:
+            waiter = self._responses.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc or ConnectionError("socket closed"))
+
+
+class RakoCommandTransport(BridgeCommanderUDP):
+    """Send UDP commands over one connected socket instead of one per command.
+
+    The bridge answers commands in the order it receives them, so responses
+    are matched to commands first in, first out. The socket is opened on the
+    first command and reopened after it was closed by an error or after a
+    command timed out, since a late response would otherwise be taken for
+    the response of the next command.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize the transport without opening the socket yet."""
+        super().__init__(host, port)
+        self._transport: asyncio.DatagramTransport | None = None
+        self._responses: deque[asyncio.Future[bytes]] = deque()
+        self._connect_lock = asyncio.Lock()
+        self.sockets_opened = 0
+
+    async def _async_get_transport(self) -> asyncio.DatagramTransport:
+        async with self._connect_lock:
+            if self._transport is None or self._transport.is_closing():
+                loop = asyncio.get_running_loop()
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _CommandProtocol(self._responses),
+                    remote_addr=(self.host, self.port),
+                )
+                self.sockets_opened += 1
+        return self._transport
+
+    async def _send_command(self, command: CommandUDP) -> None:
+        _LOGGER.debug("Sending command: %s", command)
+        waiter: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        transport: asyncio.DatagramTransport | None = None
+        responses = self._responses
+        try:
+            transport = await self._async_get_transport()
+            responses = self._responses
+            responses.append(waiter)
+            transport.sendto(bytes(command_to_byte_list(command)))
+            data = await waiter
+        except OSError as ex:
+            raise RakoBridgeError(f"cannot reach bridge: {ex}") from ex
+        finally:
+            if waiter.cancelled():
+                with suppress(ValueError):
+                    responses.remove(waiter)
+                # drop the response still to come with the socket
+                if transport is self._transport:
+                    self.close()
+
+        if data.decode("utf8", "replace").strip() != COMMAND_SUCCESS_RESPONSE:
+            _LOGGER.warning("Bad response after command %s %s", command, data)
+
+    def close(self) -> None:
+        """Close the socket, failing the commands still waiting for a response."""
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+            # the closed socket fails its own commands, not those of the next
+            self._responses = deque()
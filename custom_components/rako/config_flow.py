@@ -3,21 +3,44 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from python_rako import BridgeDescription, discover_bridge
+from python_rako import BridgeDescription
 from python_rako.bridge import Bridge
 from python_rako.const import RAKO_BRIDGE_DEFAULT_PORT
 from python_rako.exceptions import RakoBridgeError
 from python_rako.model import BridgeInfo
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_BASE, CONF_HOST, CONF_MAC, CONF_NAME, CONF_PORT
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import format_mac
 
-from .const import DOMAIN
+from .const import (
+    COMMAND_RETRIES,
+    COMMAND_TOTAL_TIMEOUT,
+    CONF_COMMAND_INTERVAL,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_DEVICE_PER_ROOM,
+    CONF_MAX_IN_FLIGHT,
+    CONF_OPTIMISTIC,
+    CONF_STATE_FLUSH_WINDOW,
+    DEFAULT_COMMAND_INTERVAL,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_DEVICE_PER_ROOM,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_STATE_FLUSH_WINDOW,
+    DOMAIN,
+    PROBE_TIMEOUT,
+)
+from .discovery import async_discover_bridges
+
+if TYPE_CHECKING:
+    from homeassistant.components import dhcp, zeroconf
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,7 +49,16 @@ class RakoConfigFlow(ConfigFlow, domain=DOMAIN):
     """RakoConfigFlow."""
 
     VERSION = 1
-    rako_timeout = 3.0
+
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, BridgeDescription] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> RakoOptionsFlow:
+        """Get the options flow for this handler."""
+        return RakoOptionsFlow(config_entry)
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -34,15 +66,22 @@ class RakoConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle a flow initiated by the user."""
         bridge_desc: BridgeDescription = {}
         if user_input is None:
-            try:
-                bridge_desc = await asyncio.wait_for(
-                    discover_bridge(), timeout=self.rako_timeout
-                )
-            except (asyncio.TimeoutError, ValueError) as ex:
-                _LOGGER.warning("Couldn't auto discover Rako bridge %s", ex)
-
-            if bridge_desc:
+            configured = {
+                format_mac(unique_id)
+                for unique_id in self._async_current_ids()
+                if unique_id
+            }
+            self._discovered = {
+                bridge["mac"]: bridge
+                for bridge in await async_discover_bridges(self.hass)
+                if format_mac(bridge["mac"]) not in configured
+            }
+            if len(self._discovered) > 1:
+                return await self.async_step_pick()
+            if self._discovered:
+                bridge_desc = next(iter(self._discovered.values()))
                 return self._show_setup_form(bridge_desc=bridge_desc)
+            _LOGGER.warning("Couldn't auto discover a Rako bridge")
             return self._show_setup_form(
                 bridge_desc=bridge_desc, errors={CONF_BASE: "no_devices_found"}
             )
@@ -73,6 +112,86 @@ class RakoConfigFlow(ConfigFlow, domain=DOMAIN):
             data=bridge_desc,
         )
 
+    async def async_step_dhcp(self, discovery_info: dhcp.DhcpServiceInfo) -> FlowResult:
+        """Handle a bridge seen on the network by DHCP."""
+        return await self._async_step_discovered(
+            {
+                "host": discovery_info.ip,
+                "port": RAKO_BRIDGE_DEFAULT_PORT,
+                "name": discovery_info.hostname,
+                # DHCP reports the MAC without separators
+                "mac": format_mac(discovery_info.macaddress),
+            }
+        )
+
+    async def async_step_zeroconf(
+        self, discovery_info: zeroconf.ZeroconfServiceInfo
+    ) -> FlowResult:
+        """Handle a bridge advertising itself over mDNS."""
+        bridge_desc: BridgeDescription = {
+            "host": discovery_info.host,
+            "port": RAKO_BRIDGE_DEFAULT_PORT,
+            "name": discovery_info.hostname.removesuffix(".local."),
+            "mac": "",
+        }
+        try:
+            # mDNS doesn't tell the MAC, which identifies the bridge
+            info = await self._get_bridge_info(bridge_desc)
+        except (RakoBridgeError, asyncio.TimeoutError):
+            return self.async_abort(reason="cannot_connect")
+        if not info.hostMAC:
+            return self.async_abort(reason="cannot_connect")
+        bridge_desc["mac"] = info.hostMAC
+        return await self._async_step_discovered(bridge_desc)
+
+    async def _async_step_discovered(
+        self, bridge_desc: BridgeDescription
+    ) -> FlowResult:
+        """Follow a configured bridge to its new address, or offer to set it up."""
+        mac = format_mac(bridge_desc["mac"])
+        for entry in self._async_current_entries(include_ignore=False):
+            if format_mac(entry.unique_id or "") != mac:
+                continue
+            if entry.data[CONF_HOST] != bridge_desc["host"]:
+                _LOGGER.info(
+                    "Rako bridge %s moved from %s to %s",
+                    entry.unique_id,
+                    entry.data[CONF_HOST],
+                    bridge_desc["host"],
+                )
+                # the update listener reloads the entry with the new host
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, CONF_HOST: bridge_desc["host"]}
+                )
+            return self.async_abort(reason="already_configured")
+
+        await self.async_set_unique_id(bridge_desc["mac"])
+        self._abort_if_unique_id_configured()
+        return self._show_setup_form(bridge_desc=bridge_desc)
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick one of several discovered bridges."""
+        if user_input is not None:
+            return self._show_setup_form(
+                bridge_desc=self._discovered[user_input[CONF_MAC]]
+            )
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_MAC): vol.In(
+                        {
+                            mac: f"{bridge['name']} ({bridge['host']})"
+                            for mac, bridge in self._discovered.items()
+                        }
+                    )
+                }
+            ),
+        )
+
     def _show_setup_form(
         self,
         bridge_desc: BridgeDescription,
@@ -95,6 +214,70 @@ class RakoConfigFlow(ConfigFlow, domain=DOMAIN):
     async def _get_bridge_info(self, bridge_desc: BridgeDescription) -> BridgeInfo:
         session = async_get_clientsession(self.hass)
         bridge = Bridge(**bridge_desc)
-        return await asyncio.wait_for(
-            bridge.get_info(session), timeout=self.rako_timeout
+        # nothing measured yet, start short and back off like the command queue
+        deadline = self.hass.loop.time() + COMMAND_TOTAL_TIMEOUT
+        timeout = PROBE_TIMEOUT
+        for _ in range(COMMAND_RETRIES):
+            try:
+                return await asyncio.wait_for(bridge.get_info(session), timeout=timeout)
+            except asyncio.TimeoutError:
+                timeout = min(timeout * 2, deadline - self.hass.loop.time())
+                if timeout <= 0:
+                    raise
+        return await asyncio.wait_for(bridge.get_info(session), timeout=timeout)
+
+
+class RakoOptionsFlow(OptionsFlow):
+    """Handle Rako options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize Rako options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the Rako options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STATE_FLUSH_WINDOW,
+                        default=options.get(
+                            CONF_STATE_FLUSH_WINDOW, DEFAULT_STATE_FLUSH_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                    vol.Optional(
+                        CONF_MAX_IN_FLIGHT,
+                        default=options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(
+                        CONF_COMMAND_INTERVAL,
+                        default=options.get(
+                            CONF_COMMAND_INTERVAL, DEFAULT_COMMAND_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                    vol.Optional(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CONFIRM_TIMEOUT,
+                        default=options.get(
+                            CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=30)),
+                    vol.Optional(
+                        CONF_DEVICE_PER_ROOM,
+                        default=options.get(
+                            CONF_DEVICE_PER_ROOM, DEFAULT_DEVICE_PER_ROOM
+                        ),
+                    ): bool,
+                }
+            ),
         )
@@ -1,2 +1,49 @@
 """Constants for the Rako integration."""
 DOMAIN = "rako"
+
+DATA_LISTENERS = f"{DOMAIN}_listeners"
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+EVENT_RAKO = f"{DOMAIN}_event"
+
+CONF_STATE_FLUSH_WINDOW = "state_flush_window"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_COMMAND_INTERVAL = "command_interval"
+CONF_OPTIMISTIC = "optimistic"
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+CONF_DEVICE_PER_ROOM = "device_per_room"
+
+DEFAULT_STATE_FLUSH_WINDOW = 0.0
+DEFAULT_MAX_IN_FLIGHT = 3
+DEFAULT_COMMAND_INTERVAL = 0.02
+DEFAULT_COMMAND_TIMEOUT = 3.0
+DEFAULT_OPTIMISTIC = True
+DEFAULT_CONFIRM_TIMEOUT = 5.0
+DEFAULT_DEVICE_PER_ROOM = False
+
+# bounds of the timeout derived from the measured round trip time
+COMMAND_TIMEOUT_MIN = 0.5
+COMMAND_TIMEOUT_MAX = 10.0
+# first timeout for a bridge without a measured round trip time
+PROBE_TIMEOUT = 1.0
+COMMAND_RETRIES = 2
+# a service call waits at most this long per frame, retries included
+COMMAND_TOTAL_TIMEOUT = 3.0
+COMMAND_RETRY_DELAY = 0.1
+# consecutive commands failing despite retries before entities go unavailable
+COMMAND_FAILURES_UNAVAILABLE = 3
+
+DISCOVERY_TIMEOUT = 2.0
+DISCOVERY_CACHE_TTL = 60.0
+# the subnet sweep never scans more than a /24 per local address
+DISCOVERY_SCAN_MIN_PREFIX = 24
+DISCOVERY_SCAN_BATCH = 32
+DISCOVERY_SCAN_INTERVAL = 0.01
+
+LISTENER_BACKOFF_MIN = 1.0
+LISTENER_BACKOFF_MAX = 60.0
+MESSAGE_RATE_WINDOW = 10.0
+RESYNC_SILENCE = 300.0
+
+# transitions up to this long, 0 included, use the bridge's default fade rate
+NATIVE_FADE_MAX_TRANSITION = 2.0
+TRANSITION_TICK = 0.5
@@ -0,0 +1,137 @@
+"""Device registry entries of a Rako bridge's rooms and channels."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import aiohttp
+import python_rako
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import DOMAIN
+from .storage import create_config_hash
+from .util import create_unique_id
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_topology_hash(rako_xml: str, device_per_room: bool) -> str:
+    """Create a hash identifying the devices made for a bridge configuration."""
+    return create_config_hash(f"{rako_xml}\ndevice_per_room={device_per_room}")
+
+
+async def async_sync_devices(
+    hass: HomeAssistant, bridge: RakoBridge, session: aiohttp.ClientSession
+) -> None:
+    """Describe the devices of the bridge's rooms and channels in one pass.
+
+    Entities only link to these devices, so the registry is written here
+    rather than once per entity. The pass is skipped while the bridge
+    configuration and device option are those of the last pass and its
+    devices are still registered.
+    """
+    rako_xml = await bridge.get_rako_xml(session)
+    topology_hash = create_topology_hash(rako_xml, bridge.device_per_room)
+    if topology_hash == bridge.topology_hash and _async_has_devices(hass, bridge):
+        return
+
+    devices: dict[str, DeviceInfo] = {}
+    # unique ID of each light and switch entity to the device it belongs to
+    entity_devices: dict[str, str] = {}
+
+    def add_device(room_id: int, channel_id: int, name: str, room_title: str) -> None:
+        device_unique_id = bridge.get_device_unique_id(room_id, channel_id)
+        entity_devices[
+            create_unique_id(bridge.mac, room_id, channel_id)
+        ] = device_unique_id
+        if bridge.device_per_room or not channel_id:
+            name = room_title
+        devices.setdefault(
+            device_unique_id,
+            {
+                "identifiers": {(DOMAIN, device_unique_id)},
+                "name": name,
+                "manufacturer": "Rako",
+                "suggested_area": room_title,
+                "via_device": (DOMAIN, bridge.mac),
+            },
+        )
+
+    for light in bridge.get_lights_from_discovery_xml(rako_xml):
+        if isinstance(light, python_rako.ChannelLight):
+            name = f"{light.room_title} - {light.channel_name}"
+        else:
+            name = light.room_title
+        add_device(light.room_id, light.channel_id, name, light.room_title)
+    if bridge.supports_switches:
+        async for switch in bridge.discover_switches(session):
+            add_device(
+                switch.room_id, switch.channel_id, switch.name, switch.room_title
+            )
+
+    _async_update_registries(hass, bridge, devices, entity_devices)
+    bridge.async_set_topology_hash(topology_hash)
+
+
+@callback
+def _async_has_devices(hass: HomeAssistant, bridge: RakoBridge) -> bool:
+    """Return whether the registry holds devices besides the bridge's own."""
+    return any(
+        (DOMAIN, bridge.mac) not in device.identifiers
+        for device in dr.async_entries_for_config_entry(
+            dr.async_get(hass), bridge.entry_id
+        )
+    )
+
+
+@callback
+def _async_update_registries(
+    hass: HomeAssistant,
+    bridge: RakoBridge,
+    devices: dict[str, DeviceInfo],
+    entity_devices: dict[str, str],
+) -> None:
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    device_ids = {
+        device_unique_id: device_registry.async_get_or_create(
+            config_entry_id=bridge.entry_id, **device_info
+        ).id
+        for device_unique_id, device_info in devices.items()
+    }
+
+    # move entities first, removing a device would remove its entities
+    moved = 0
+    for entity in er.async_entries_for_config_entry(entity_registry, bridge.entry_id):
+        device_unique_id = entity_devices.get(entity.unique_id)
+        if device_unique_id is None:
+            continue
+        if entity.device_id != (device_id := device_ids[device_unique_id]):
+            entity_registry.async_update_entity(entity.entity_id, device_id=device_id)
+            moved += 1
+
+    keep = {(DOMAIN, device_unique_id) for device_unique_id in devices}
+    keep.add((DOMAIN, bridge.mac))
+    removed = 0
+    for device in dr.async_entries_for_config_entry(device_registry, bridge.entry_id):
+        if device.identifiers.isdisjoint(keep):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=bridge.entry_id
+            )
+            removed += 1
+
+    _LOGGER.debug(
+        "Synced devices of Rako bridge %s: %d devices, %d entities moved, "
+        "%d devices removed",
+        bridge.mac,
+        len(devices),
+        moved,
+        removed,
+    )
@@ -0,0 +1,32 @@
+"""Diagnostics support for Rako."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_MAC
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .model import RakoDomainEntryData
+
+TO_REDACT = {CONF_HOST, CONF_MAC}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
+    bridge = rako_domain_entry_data["rako_bridge_client"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "lights": len(rako_domain_entry_data["rako_light_map"]),
+        "switches": len(rako_domain_entry_data["rako_switch_map"]),
+        "stats": bridge.get_stats(),
+    }
@@ -0,0 +1,126 @@
+"""Discovery of the Rako bridges on the local network."""
+from __future__ import annotations
+
+import asyncio
+from ipaddress import IPv4Address, ip_network
+import logging
+
+from python_rako import BridgeDescription
+from python_rako.const import RAKO_BRIDGE_DEFAULT_PORT
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import format_mac
+
+from .const import (
+    DATA_DISCOVERY,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_SCAN_BATCH,
+    DISCOVERY_SCAN_INTERVAL,
+    DISCOVERY_SCAN_MIN_PREFIX,
+    DISCOVERY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_REQUEST = b"D"
+
+
+async def async_discover_bridges(hass: HomeAssistant) -> list[BridgeDescription]:
+    """Return all bridges found on the network, cached for a short while."""
+    if (discovery := hass.data.get(DATA_DISCOVERY)) is None:
+        discovery = hass.data[DATA_DISCOVERY] = RakoDiscovery(hass)
+    return await discovery.async_discover()
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collect the replies of bridges to discovery datagrams."""
+
+    def __init__(self, found: dict[str, BridgeDescription]) -> None:
+        self._found = found
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        try:
+            name, mac = data.decode("utf8").split()
+        except (UnicodeDecodeError, ValueError):
+            _LOGGER.debug("Ignoring discovery reply %s from %s", data, addr[0])
+            return
+        self._found[format_mac(mac)] = {
+            "host": addr[0],
+            "port": addr[1],
+            "name": name,
+            "mac": mac,
+        }
+
+
+class RakoDiscovery:
+    """Probe for bridges by broadcast and by sweeping the local networks.
+
+    A broadcast only reaches bridges on our own segment, so the local
+    networks are also swept with unicast discovery datagrams, in batches to
+    bound the burst. Concurrent and repeated discoveries within the TTL
+    share one result.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the discovery."""
+        self.hass = hass
+        self._task: asyncio.Task[list[BridgeDescription]] | None = None
+        self._expires = 0.0
+
+    async def async_discover(self) -> list[BridgeDescription]:
+        """Return the bridges found, probing unless a recent result is cached."""
+        if self._task is None or (
+            self._task.done() and self.hass.loop.time() >= self._expires
+        ):
+            self._task = asyncio.create_task(self._async_discover())
+        return await asyncio.shield(self._task)
+
+    async def _async_discover(self) -> list[BridgeDescription]:
+        found: dict[str, BridgeDescription] = {}
+        await self._async_probe_udp(found)
+        self._expires = self.hass.loop.time() + DISCOVERY_CACHE_TTL
+        _LOGGER.debug("Discovered Rako bridges: %s", found)
+        return list(found.values())
+
+    async def _async_probe_udp(self, found: dict[str, BridgeDescription]) -> None:
+        loop = self.hass.loop
+        deadline = loop.time() + DISCOVERY_TIMEOUT
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DiscoveryProtocol(found),
+                local_addr=("0.0.0.0", 0),
+                allow_broadcast=True,
+            )
+        except OSError as ex:
+            _LOGGER.warning("Couldn't open a socket for Rako discovery: %s", ex)
+            return
+
+        try:
+            transport.sendto(
+                DISCOVERY_REQUEST, ("255.255.255.255", RAKO_BRIDGE_DEFAULT_PORT)
+            )
+            for index, host in enumerate(await self._async_scan_hosts()):
+                if index and not index % DISCOVERY_SCAN_BATCH:
+                    await asyncio.sleep(DISCOVERY_SCAN_INTERVAL)
+                transport.sendto(DISCOVERY_REQUEST, (host, RAKO_BRIDGE_DEFAULT_PORT))
+            await asyncio.sleep(max(deadline - loop.time(), 0))
+        finally:
+            transport.close()
+
+    async def _async_scan_hosts(self) -> list[str]:
+        """Return the addresses of the local IPv4 networks, at most a /24 each."""
+        hosts: set[str] = set()
+        own: set[str] = set()
+        for adapter in await network.async_get_adapters(self.hass):
+            if not adapter["enabled"]:
+                continue
+            for ipv4 in adapter["ipv4"]:
+                address = ipv4["address"]
+                if IPv4Address(address).is_loopback:
+                    continue
+                own.add(address)
+                prefix = max(ipv4["network_prefix"], DISCOVERY_SCAN_MIN_PREFIX)
+                subnet = ip_network(f"{address}/{prefix}", strict=False)
+                hosts.update(str(host) for host in subnet.hosts())
+        return sorted(hosts - own)
@@ -0,0 +1,114 @@
+"""Platform for Rako room events, e.g. keypad presses."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import python_rako
+from python_rako.model import ChannelStatusMessage, SceneStatusMessage, StatusMessage
+
+from homeassistant.components.event import EventEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, EVENT_RAKO
+from .util import create_unique_id
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+    from .model import RakoDomainEntryData
+
+EVENT_TYPE_SCENE = "scene"
+EVENT_TYPE_LEVEL = "level"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the config entry."""
+    rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
+    bridge = rako_domain_entry_data["rako_bridge_client"]
+
+    session = async_get_clientsession(hass)
+
+    async_add_entities(
+        [
+            RakoRoomEvent(bridge, light)
+            async for light in bridge.discover_lights(session)
+            if isinstance(light, python_rako.RoomLight)
+        ]
+    )
+
+
+class RakoRoomEvent(EventEntity):
+    """Status messages of a Rako room, such as scenes recalled from a keypad.
+
+    Each event is also fired on the bus as ``rako_event``. Every status
+    message of the room, including the echo of our own commands, is a state
+    write and a bus event, so the entities are disabled by default and
+    enabling the entity of a room opts it in at the listener. Like the
+    lights, an event entity keeps only its IDs and builds its unique ID and
+    name once.
+    """
+
+    __slots__ = ("bridge", "room_id")
+
+    _attr_entity_registry_enabled_default = False
+    _attr_event_types = [EVENT_TYPE_SCENE, EVENT_TYPE_LEVEL]
+    _attr_should_poll = False
+
+    def __init__(self, bridge: RakoBridge, room_light: python_rako.RoomLight) -> None:
+        """Initialize a RakoRoomEvent."""
+        self.bridge = bridge
+        self.room_id: int = room_light.room_id
+        room_unique_id = create_unique_id(bridge.mac, room_light.room_id, 0)
+        self._attr_unique_id = f"{room_unique_id}events"
+        self._attr_name = f"{room_light.room_title} - Events"
+
+    @callback
+    def async_status_received(
+        self, status_message: StatusMessage, matched: bool
+    ) -> None:
+        """Publish a status message pushed for this room."""
+        event_data: dict[str, Any] = {
+            "channel": status_message.channel,
+            "matched": matched,
+        }
+        if isinstance(status_message, SceneStatusMessage):
+            event_type = EVENT_TYPE_SCENE
+            event_data["scene"] = status_message.scene
+        elif isinstance(status_message, ChannelStatusMessage):
+            event_type = EVENT_TYPE_LEVEL
+            event_data["brightness"] = status_message.brightness
+        else:
+            return
+
+        self._trigger_event(event_type, event_data)
+        self.async_write_ha_state()
+        self.hass.bus.async_fire(
+            EVENT_RAKO,
+            {
+                "bridge": self.bridge.mac,
+                "room": self.room_id,
+                "type": event_type,
+                **event_data,
+            },
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        await self.bridge.register_event_for_state_updates(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Run when entity will be removed from hass."""
+        await self.bridge.deregister_event_for_state_updates(self)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Link the events to the device of their room."""
+        device_unique_id = self.bridge.get_device_unique_id(self.room_id, 0)
+        return DeviceInfo(identifiers={(DOMAIN, device_unique_id)})
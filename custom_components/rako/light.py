@@ -8,19 +8,22 @@ from typing import TYPE_CHECKING, Any
 import python_rako
 from python_rako.exceptions import RakoBridgeError
 from python_rako.helpers import convert_to_brightness, convert_to_scene
+from python_rako.model import RoomChannel
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
+    ATTR_TRANSITION,
     SUPPORT_BRIGHTNESS,
+    SUPPORT_TRANSITION,
     LightEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, NATIVE_FADE_MAX_TRANSITION
 from .util import create_unique_id
 
 if TYPE_CHECKING:
@@ -39,10 +42,11 @@ async def async_setup_entry(
     rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
     bridge = rako_domain_entry_data["rako_bridge_client"]
 
-    hass_lights: list[Entity] = []
+    hass_lights: list[RakoLight] = []
     session = async_get_clientsession(hass)
 
-    bridge.level_cache, bridge.scene_cache = await bridge.get_cache_state()
+    # the bridge configuration is fetched concurrently, see async_start_discovery
+    await bridge.async_load_cache_state()
 
     async for light in bridge.discover_lights(session):
         if isinstance(light, python_rako.ChannelLight):
@@ -54,47 +58,78 @@ async def async_setup_entry(
 
         hass_lights.append(hass_light)
 
-    async_add_entities(hass_lights, True)
+    # the state comes from the caches, there is nothing to update before adding
+    async_add_entities(hass_lights)
 
 
 class RakoLight(LightEntity):
-    """Representation of a Rako Light."""
+    """Representation of a Rako Light.
+
+    Large bridges have a thousand of these, so a light keeps only the IDs
+    it needs instead of the discovered ``python_rako`` light, and its unique
+    ID and name are built once for HA's cached properties. Its own
+    attributes live in slots, HA's in the instance dict.
+    """
+
+    __slots__ = (
+        "bridge",
+        "room_id",
+        "channel_id",
+        "_brightness",
+        "_available",
+        "_written_state",
+        "suppressed_writes",
+        "_optimistic_target",
+        "_confirmed_brightness",
+        "_confirm_handle",
+    )
+
+    _attr_should_poll = False
+    _attr_supported_features = SUPPORT_BRIGHTNESS
 
     def __init__(self, bridge: RakoBridge, light: python_rako.Light) -> None:
         """Initialize a RakoLight."""
         self.bridge = bridge
-        self._light = light
-        self._brightness = self._init_get_brightness_from_cache()
+        self.room_id: int = light.room_id
+        # 0 for a whole room
+        self.channel_id: int = light.channel_id
+        self._attr_unique_id = create_unique_id(
+            bridge.mac, light.room_id, light.channel_id
+        )
+        self._brightness = self.get_brightness_from_cache()
         self._available = True
-
-    @property
-    def name(self) -> str:
-        """Return the display name of this light."""
-        raise NotImplementedError()
-
-    def _init_get_brightness_from_cache(self) -> int:
+        self._written_state: tuple[int, bool] | None = None
+        self.suppressed_writes = 0
+        self._optimistic_target: int | None = None
+        self._confirmed_brightness = self._brightness
+        self._confirm_handle: asyncio.TimerHandle | None = None
+
+    def get_brightness_from_cache(self) -> int:
+        """Return the brightness according to the bridge's scene and level caches."""
         raise NotImplementedError()
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
+        # HA writes the initial state once the entity has been added
+        self._written_state = (self._brightness, self._available)
         await self.bridge.register_for_state_updates(self)
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity about to be added to hass."""
+        self._async_clear_optimistic()
         await self.bridge.deregister_for_state_updates(self)
 
-    @property
-    def unique_id(self) -> str:
-        """Light's unique ID."""
-        return create_unique_id(
-            self.bridge.mac, self._light.room_id, self._light.channel_id
-        )
-
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         return self._available
 
+    @available.setter
+    def available(self, value: bool) -> None:
+        """Set the availability. Used when the bridge can't be reached."""
+        self._available = value
+        self.async_write_ha_state_if_changed()
+
     @property
     def brightness(self) -> int:
         """Return the brightness of the light."""
@@ -103,7 +138,77 @@ class RakoLight(LightEntity):
     @brightness.setter
     def brightness(self, value: int) -> None:
         """Set the brightness. Used when state is updated outside Home Assistant."""
+        # the bridge told us, so it can be reached again
+        self._available = True
+        if self._optimistic_target is not None:
+            self._confirmed_brightness = value
+            if value != self._optimistic_target:
+                # not the echo of our command, keep showing its target
+                self.async_write_ha_state_if_changed()
+                return
+            self._async_clear_optimistic()
         self._brightness = value
+        self.async_write_ha_state_if_changed()
+
+    @callback
+    def _async_set_optimistic(self, brightness: int) -> None:
+        """Show the target of a command until the bridge confirms or times out."""
+        if not self.bridge.optimistic:
+            return
+        if self._optimistic_target is None:
+            self._confirmed_brightness = self._brightness
+        elif self._confirm_handle:
+            self._confirm_handle.cancel()
+        self._optimistic_target = brightness
+        self._confirm_handle = self.hass.loop.call_later(
+            self.bridge.confirm_timeout, self._async_rollback
+        )
+        self._brightness = brightness
+        self.async_write_ha_state_if_changed()
+
+    @callback
+    def _async_rollback(self) -> None:
+        """Restore the last confirmed brightness of an unconfirmed command."""
+        if self._optimistic_target is None:
+            return
+        _LOGGER.warning(
+            "Rako Light %s didn't confirm brightness %s, rolling back to %s",
+            self.name,
+            self._optimistic_target,
+            self._confirmed_brightness,
+        )
+        self.bridge.optimistic_rollbacks += 1
+        self._async_clear_optimistic()
+        self._brightness = self._confirmed_brightness
+        self.async_write_ha_state_if_changed()
+
+    @callback
+    def _async_clear_optimistic(self) -> None:
+        self._optimistic_target = None
+        if self._confirm_handle:
+            self._confirm_handle.cancel()
+            self._confirm_handle = None
+
+    @callback
+    def _async_command_failed(self, ex: Exception) -> None:
+        """Roll back a failed command, going unavailable once failures persist."""
+        self._async_rollback()
+        if not self.bridge.commands_failing:
+            _LOGGER.debug("Command for Rako Light %s failed: %r", self.name, ex)
+            return
+        if self._available:
+            _LOGGER.error("An error occurred while updating the Rako Light")
+        self.available = False
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state to HA only on a real brightness or availability change."""
+        state = (self._brightness, self._available)
+        if state == self._written_state:
+            self.suppressed_writes += 1
+            self.bridge.suppressed_state_writes += 1
+            return
+        self._written_state = state
         self.async_write_ha_state()
 
     @property
@@ -111,30 +216,18 @@ class RakoLight(LightEntity):
         """Return true if light is on."""
         return self.brightness > 0
 
-    @property
-    def should_poll(self) -> bool:
-        """Entity pushes its state to HA."""
-        return False
-
-    @property
-    def supported_features(self) -> int:
-        """Flag supported features."""
-        return SUPPORT_BRIGHTNESS
-
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
-        await self.async_turn_on(brightness=0)
+        await self.async_turn_on(**{**kwargs, ATTR_BRIGHTNESS: 0})
 
     @property
     def device_info(self) -> DeviceInfo:
-        """Return device information about this Rako Light."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
-            "manufacturer": "Rako",
-            "suggested_area": self._light.room_title,
-            "via_device": (DOMAIN, self.bridge.mac),
-        }
+        """Link this Rako Light to its device, see devices.async_sync_devices."""
+        # only read when the entity is added, not worth keeping per light
+        device_unique_id = self.bridge.get_device_unique_id(
+            self.room_id, self.channel_id
+        )
+        return DeviceInfo(identifiers={(DOMAIN, device_unique_id)})
 
 
 class RakoRoomLight(RakoLight):
@@ -143,70 +236,76 @@ class RakoRoomLight(RakoLight):
     def __init__(self, bridge: RakoBridge, light: python_rako.RoomLight) -> None:
         """Initialize a RakoLight."""
         super().__init__(bridge, light)
-        self._light: python_rako.RoomLight = light
+        self._attr_name = light.room_title
 
-    def _init_get_brightness_from_cache(self) -> int:
-        scene_of_room = self.bridge.scene_cache.get(self._light.room_id, 0)
+    def get_brightness_from_cache(self) -> int:
+        scene_of_room = self.bridge.scene_cache.get(self.room_id, 0)
         brightness: int = convert_to_brightness(scene_of_room)
         return brightness
 
-    @property
-    def name(self) -> str:
-        """Return the display name of this light."""
-        room_title: str = self._light.room_title
-        return room_title
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
+        scene = convert_to_scene(brightness)
+        self._async_set_optimistic(convert_to_brightness(scene))
 
         try:
-            scene = convert_to_scene(brightness)
-            await asyncio.wait_for(
-                self.bridge.set_room_scene(self._light.room_id, scene), timeout=3.0
-            )
+            await self.bridge.async_queue_room_scene(self.room_id, scene)
 
-        except (RakoBridgeError, asyncio.TimeoutError):
-            if self._available:
-                _LOGGER.error("An error occurred while updating the Rako Light")
-            self._available = False
+        except (RakoBridgeError, asyncio.TimeoutError) as ex:
+            self._async_command_failed(ex)
             return
 
+        self.available = True
+
 
 class RakoChannelLight(RakoLight):
     """Representation of a Rako Channel Light."""
 
+    # room lights recall scenes, which have no transition
+    _attr_supported_features = SUPPORT_BRIGHTNESS | SUPPORT_TRANSITION
+
     def __init__(self, bridge: RakoBridge, light: python_rako.ChannelLight) -> None:
         """Initialize a RakoLight."""
         super().__init__(bridge, light)
-        self._light: python_rako.ChannelLight = light
+        self._attr_name = f"{light.room_title} - {light.channel_name}"
 
-    def _init_get_brightness_from_cache(self) -> int:
-        scene_of_room = self.bridge.scene_cache.get(self._light.room_id, 0)
+    def get_brightness_from_cache(self) -> int:
+        scene_of_room = self.bridge.scene_cache.get(self.room_id, 0)
         brightness: int = self.bridge.level_cache.get_channel_level(
-            self._light.room_channel, scene_of_room
+            RoomChannel(self.room_id, self.channel_id), scene_of_room
         )
         return brightness
 
-    @property
-    def name(self) -> str:
-        """Return the display name of this light."""
-        return f"{self._light.room_title} - {self._light.channel_name}"
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
+        transition = kwargs.get(ATTR_TRANSITION)
+        if transition is not None and transition > NATIVE_FADE_MAX_TRANSITION:
+            # longer than the bridge's own fade, step it from the shared timer
+            self._async_clear_optimistic()
+            self.bridge.transitions.async_start(
+                self.room_id,
+                self.channel_id,
+                self._brightness,
+                brightness,
+                transition,
+                self._async_command_failed,
+            )
+            return
+        # shorter transitions, 0 included, fade at the bridge's default rate:
+        # python_rako only sends levels with that rate
+
+        self.bridge.transitions.async_cancel(self.room_id, self.channel_id)
+        self._async_set_optimistic(brightness)
 
         try:
-            await asyncio.wait_for(
-                self.bridge.set_channel_brightness(
-                    self._light.room_id, self._light.channel_id, brightness
-                ),
-                timeout=3.0,
+            await self.bridge.async_queue_channel_brightness(
+                self.room_id, self.channel_id, brightness
             )
 
-        except (RakoBridgeError, asyncio.TimeoutError):
-            if self._available:
-                _LOGGER.error("An error occurred while updating the Rako Light")
-            self._available = False
+        except (RakoBridgeError, asyncio.TimeoutError) as ex:
+            self._async_command_failed(ex)
             return
+
+        self.available = True
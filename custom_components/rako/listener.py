@@ -0,0 +1,169 @@
+"""Datagram listener shared by the Rako bridges pushing to one port."""
+from __future__ import annotations
+
+import asyncio
+from asyncio import Task
+import logging
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from python_rako.helpers import deserialise_byte_list
+from python_rako.model import StatusMessage
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_LISTENERS,
+    LISTENER_BACKOFF_MAX,
+    LISTENER_BACKOFF_MIN,
+    RESYNC_SILENCE,
+)
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_listener(hass: HomeAssistant, port: int) -> RakoListener:
+    """Return the listener for a port, creating it if needed."""
+    listeners: dict[int, RakoListener] = hass.data.setdefault(DATA_LISTENERS, {})
+    if (listener := listeners.get(port)) is None:
+        listener = listeners[port] = RakoListener(hass, port)
+    return listener
+
+
+class RakoListener:
+    """One datagram socket and task per port, routing by source address."""
+
+    def __init__(self, hass: HomeAssistant, port: int) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self.port = port
+        self._bridges: dict[str, RakoBridge] = {}
+        self._task: Task | None = None
+
+    @callback
+    def async_add_bridge(self, bridge: RakoBridge) -> None:
+        """Route datagrams from the bridge's host to it, starting to listen."""
+        self._bridges[bridge.host] = bridge
+        if self._task is None:
+            self._task = asyncio.create_task(
+                listen_for_state_updates(self, self._bridges),
+                name=f"rako_{self.port}_listener_task",
+            )
+
+    async def async_remove_bridge(self, bridge: RakoBridge) -> None:
+        """Stop routing to the bridge, closing the socket after the last one."""
+        self._bridges.pop(bridge.host, None)
+        if self._bridges:
+            return
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        listeners: dict[int, RakoListener] = self.hass.data[DATA_LISTENERS]
+        if listeners.get(self.port) is self:
+            del listeners[self.port]
+        if not listeners:
+            del self.hass.data[DATA_LISTENERS]
+
+
+class RakoDatagramProtocol(asyncio.DatagramProtocol):
+    """Parse and dispatch pushed datagrams synchronously on the event loop."""
+
+    def __init__(
+        self,
+        bridges: dict[str, RakoBridge],
+        connection_lost: asyncio.Future[Exception | None],
+    ) -> None:
+        """Initialize the protocol."""
+        self._bridges = bridges
+        self._connection_lost = connection_lost
+        self.datagrams_received = 0
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Route a datagram to the bridge that sent it."""
+        self.datagrams_received += 1
+        if (bridge := self._bridges.get(addr[0])) is None:
+            return
+        bridge.async_message_received()
+        start = perf_counter()
+        try:
+            message = deserialise_byte_list(list(data))
+            if isinstance(message, StatusMessage):
+                bridge.async_dispatch_status(message)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error handling Rako datagram %s", data)
+        bridge.dispatch_latency.add(perf_counter() - start)
+
+    def error_received(self, exc: Exception) -> None:
+        """Log errors reported for the socket, which stays open."""
+        _LOGGER.debug("Rako listener socket error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Wake up the supervisor to reopen the socket."""
+        if not self._connection_lost.done():
+            self._connection_lost.set_result(exc)
+
+
+async def listen_for_state_updates(
+    listener: RakoListener, bridges: dict[str, RakoBridge]
+) -> None:
+    """Listen for state updates worker method, reopening the socket on errors."""
+    loop = asyncio.get_running_loop()
+    backoff = LISTENER_BACKOFF_MIN
+    while True:
+        connection_lost: asyncio.Future[Exception | None] = loop.create_future()
+        transport: asyncio.BaseTransport | None = None
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: RakoDatagramProtocol(bridges, connection_lost),
+                local_addr=("0.0.0.0", listener.port),
+            )
+            for bridge in bridges.values():
+                bridge.async_set_listener_connected(True)
+
+            received = 0
+            while not connection_lost.done():
+                await asyncio.wait((connection_lost,), timeout=RESYNC_SILENCE)
+                if protocol.datagrams_received != received:
+                    received = protocol.datagrams_received
+                    backoff = LISTENER_BACKOFF_MIN
+                elif not connection_lost.done():
+                    for bridge in bridges.values():
+                        bridge.async_request_resync()
+            _LOGGER.warning(
+                "Rako listener on port %s closed, reopening in %ss: %s",
+                listener.port,
+                backoff,
+                connection_lost.result(),
+            )
+        except OSError as ex:
+            _LOGGER.warning(
+                "Rako listener on port %s error, retrying in %ss: %s",
+                listener.port,
+                backoff,
+                ex,
+            )
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(
+                "Unexpected error in Rako listener on port %s, retrying in %ss",
+                listener.port,
+                backoff,
+            )
+        finally:
+            if transport:
+                transport.close()
+
+        for bridge in bridges.values():
+            bridge.async_set_listener_connected(False)
+            bridge.listener_restarts += 1
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, LISTENER_BACKOFF_MAX)
@@ -1,12 +1,14 @@
 """Rako shared models."""
 from __future__ import annotations
 
-from asyncio import Task
 from typing import TYPE_CHECKING, TypedDict
 
+from homeassistant.const import Platform
+
 if TYPE_CHECKING:
     from .bridge import RakoBridge
     from .light import RakoLight
+    from .switch import RakoSwitch
 
 
 class RakoDomainEntryData(TypedDict):
@@ -14,4 +16,5 @@ class RakoDomainEntryData(TypedDict):
 
     rako_bridge_client: RakoBridge
     rako_light_map: dict[str, RakoLight]
-    rako_listener_task: Task | None
+    rako_switch_map: dict[str, RakoSwitch]
+    rako_platforms: list[Platform]
@@ -0,0 +1,86 @@
+"""Platform for scene integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+import python_rako
+from python_rako.exceptions import RakoBridgeError
+
+from homeassistant.components.scene import Scene
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .util import create_unique_id
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+    from .model import RakoDomainEntryData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the config entry."""
+    rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
+    bridge = rako_domain_entry_data["rako_bridge_client"]
+
+    session = async_get_clientsession(hass)
+
+    # the scenes of a room come from its channel levels in the level cache
+    await bridge.async_load_cache_state()
+
+    async_add_entities(
+        [
+            RakoScene(bridge, light, scene)
+            async for light in bridge.discover_lights(session)
+            if isinstance(light, python_rako.RoomLight)
+            for scene in bridge.get_room_scenes(light.room_id)
+        ]
+    )
+
+
+class RakoScene(Scene):
+    """Representation of a Rako room scene.
+
+    Like the lights, a scene keeps only its IDs and builds its unique ID and
+    name once.
+    """
+
+    __slots__ = ("bridge", "room_id", "_scene")
+
+    def __init__(
+        self, bridge: RakoBridge, room_light: python_rako.RoomLight, scene: int
+    ) -> None:
+        """Initialize a RakoScene."""
+        self.bridge = bridge
+        self.room_id: int = room_light.room_id
+        self._scene = scene
+        room_unique_id = create_unique_id(bridge.mac, room_light.room_id, 0)
+        self._attr_unique_id = f"{room_unique_id}s:{scene}"
+        if scene == 0:
+            self._attr_name = f"{room_light.room_title} - Off"
+        else:
+            self._attr_name = f"{room_light.room_title} - Scene {scene}"
+
+    async def async_activate(self, **kwargs: Any) -> None:
+        """Recall the scene in its room."""
+        try:
+            await self.bridge.async_activate_room_scene(self.room_id, self._scene)
+        except (RakoBridgeError, asyncio.TimeoutError):
+            _LOGGER.error("An error occurred while activating the Rako Scene")
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Link the scenes to the device of their room."""
+        device_unique_id = self.bridge.get_device_unique_id(self.room_id, 0)
+        return DeviceInfo(identifiers={(DOMAIN, device_unique_id)})
@@ -0,0 +1,128 @@
+"""Platform for Rako bridge diagnostic sensors."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+    from .model import RakoDomainEntryData
+
+# the counters are in memory, reading them periodically is cheap
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+@dataclass
+class RakoSensorEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[RakoBridge], StateType]
+
+
+@dataclass
+class RakoSensorEntityDescription(
+    SensorEntityDescription, RakoSensorEntityDescriptionMixin
+):
+    """Describes a Rako bridge diagnostic sensor."""
+
+
+SENSORS: tuple[RakoSensorEntityDescription, ...] = (
+    RakoSensorEntityDescription(
+        key="message_rate",
+        name="Messages per second",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: round(bridge.get_message_rate(), 2),
+    ),
+    RakoSensorEntityDescription(
+        key="dispatch_latency_p99",
+        name="Dispatch latency p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: _to_ms(bridge.dispatch_latency.percentile(0.99)),
+    ),
+    RakoSensorEntityDescription(
+        key="unmatched_messages",
+        name="Unmatched messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda bridge: bridge.unmatched_messages,
+    ),
+    RakoSensorEntityDescription(
+        key="command_rtt_p50",
+        name="Command round trip p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: _to_ms(
+            bridge.command_queue.command_rtt.percentile(0.5)
+        ),
+    ),
+    RakoSensorEntityDescription(
+        key="command_rtt_p99",
+        name="Command round trip p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda bridge: _to_ms(
+            bridge.command_queue.command_rtt.percentile(0.99)
+        ),
+    ),
+    RakoSensorEntityDescription(
+        key="command_timeouts",
+        name="Command timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda bridge: bridge.command_queue.command_timeouts,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the config entry."""
+    rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
+    bridge = rako_domain_entry_data["rako_bridge_client"]
+
+    async_add_entities(RakoBridgeSensor(bridge, description) for description in SENSORS)
+
+
+class RakoBridgeSensor(SensorEntity):
+    """Representation of a Rako bridge diagnostic sensor."""
+
+    entity_description: RakoSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, bridge: RakoBridge, description: RakoSensorEntityDescription
+    ) -> None:
+        """Initialize a RakoBridgeSensor."""
+        self.bridge = bridge
+        self.entity_description = description
+        self._attr_unique_id = f"{bridge.mac}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, bridge.mac)})
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current value of the counter."""
+        return self.entity_description.value_fn(self.bridge)
@@ -0,0 +1,105 @@
+"""Performance statistics for Rako bridges."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# upper bucket bounds, in seconds
+DURATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+class RakoHistogram:
+    """Fixed bucket histogram of durations, cheap enough for the push path."""
+
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Record a duration in seconds."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding this fraction of values."""
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary in milliseconds, e.g. for diagnostics."""
+        p50 = self.percentile(0.5)
+        p99 = self.percentile(0.99)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "p50_ms": p50 * 1000 if p50 is not None else None,
+            "p99_ms": p99 * 1000 if p99 is not None else None,
+            "max_ms": self.max * 1000,
+            "buckets_ms": {
+                f"{bound * 1000:g}": count
+                for bound, count in zip(self.buckets, self.counts)
+            }
+            | {"inf": self.counts[-1]},
+        }
+
+
+class RakoRttEstimator:
+    """Smoothed round trip time and the command timeout derived from it.
+
+    Follows the TCP retransmission timeout of RFC 6298: the timeout is the
+    smoothed RTT plus four times its variation. The command queue doubles it
+    for the retries of a command that timed out, without changing the
+    estimate.
+    """
+
+    def __init__(
+        self, initial_timeout: float, min_timeout: float, max_timeout: float
+    ) -> None:
+        """Initialize the estimator without any samples."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.timeout = initial_timeout
+
+    def add(self, rtt: float) -> None:
+        """Update the estimate with a measured round trip time in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.timeout = min(
+            max(self.srtt + 4 * self.rttvar, self.min_timeout), self.max_timeout
+        )
@@ -0,0 +1,71 @@
+"""Persistent snapshot of a Rako bridge's configuration and caches."""
+from __future__ import annotations
+
+import hashlib
+from typing import TypedDict
+
+from python_rako.model import LevelCache, LevelCacheItem, RoomChannel, SceneCache
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+
+
+class RakoSnapshot(TypedDict):
+    """Bridge configuration and last known levels, as stored on disk."""
+
+    config_hash: str
+    rako_xml: str
+    # [active_deleted_reserved, room, channel, level of scene 1..17]
+    level_cache: list[list[int]]
+    scene_cache: dict[str, int]
+    # devices last written to the registry, see devices.async_sync_devices
+    topology_hash: str | None
+
+
+def create_snapshot_store(hass: HomeAssistant, mac: str) -> Store[RakoSnapshot]:
+    """Create the store holding the snapshot of the bridge with this MAC."""
+    key = f"{DOMAIN}.{mac.replace(':', '').lower()}"
+    return Store(hass, STORAGE_VERSION, key)
+
+
+def create_config_hash(rako_xml: str) -> str:
+    """Create a hash identifying a bridge configuration."""
+    return hashlib.sha256(rako_xml.encode()).hexdigest()
+
+
+def snapshot_from_state(
+    rako_xml: str,
+    level_cache: LevelCache,
+    scene_cache: SceneCache,
+    topology_hash: str | None,
+) -> RakoSnapshot:
+    """Create a snapshot from the bridge configuration and caches."""
+    return {
+        "config_hash": create_config_hash(rako_xml),
+        "rako_xml": rako_xml,
+        "level_cache": [
+            [lci.active_deleted_reserved, lci.room, lci.channel]
+            + [lci.scene_levels.get(scene, 0) for scene in range(1, 18)]
+            for lci in level_cache.values()
+        ],
+        "scene_cache": {str(room): scene for room, scene in scene_cache.items()},
+        "topology_hash": topology_hash,
+    }
+
+
+def caches_from_snapshot(snapshot: RakoSnapshot) -> tuple[LevelCache, SceneCache]:
+    """Rebuild the level and scene caches stored in a snapshot."""
+    level_cache = LevelCache()
+    for active_deleted_reserved, room, channel, *levels in snapshot["level_cache"]:
+        level_cache[RoomChannel(room, channel)] = LevelCacheItem(
+            active_deleted_reserved, room, channel, dict(enumerate(levels, start=1))
+        )
+    scene_cache = SceneCache(
+        {int(room): scene for room, scene in snapshot["scene_cache"].items()}
+    )
+    return level_cache, scene_cache
@@ -10,9 +10,9 @@ from python_rako.exceptions import RakoBridgeError
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
@@ -34,7 +34,7 @@ async def async_setup_entry(
     rako_domain_entry_data: RakoDomainEntryData = hass.data[DOMAIN][entry.unique_id]
     bridge = rako_domain_entry_data["rako_bridge_client"]
 
-    hass_switches: list[Entity] = []
+    hass_switches: list[RakoSwitch] = []
     session = async_get_clientsession(hass)
 
     async for switch in bridge.discover_switches(session):
@@ -45,86 +45,98 @@ async def async_setup_entry(
 
         hass_switches.append(hass_switch)
 
-    async_add_entities(hass_switches, True)
+    async_add_entities(hass_switches)
 
 
 class RakoSwitch(SwitchEntity):
-    """Representation of a Rako Switch."""
+    """Representation of a Rako Switch.
+
+    Like a RakoLight, a switch keeps only its IDs in slots and builds its
+    unique ID and name once.
+    """
+
+    __slots__ = ("bridge", "room_id", "channel_id", "_state", "_available")
 
     def __init__(self, bridge: RakoBridge, switch: python_rako.Switch) -> None:
         """Initialize a RakoSwitch."""
         self.bridge = bridge
-        self._switch = switch
+        self.room_id: int = switch.room_id
+        self.channel_id: int = switch.channel_id
+        self._attr_unique_id = create_unique_id(
+            bridge.mac, switch.room_id, switch.channel_id
+        )
+        self._attr_name = switch.name
         self._state = False
         self._available = True
 
-    @property
-    def name(self) -> str:
-        """Return the display name of this switch."""
-        return self._switch.name
-
-    @property
-    def unique_id(self) -> str:
-        """Switch's unique ID."""
-        return create_unique_id(
-            self.bridge.mac, self._switch.room_id, self._switch.channel_id
-        )
-
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         return self._available
 
+    @available.setter
+    def available(self, value: bool) -> None:
+        """Set the availability. Used when the bridge can't be reached."""
+        if self._available != value:
+            self._available = value
+            self.async_write_ha_state()
+
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
         return self._state
 
+    @is_on.setter
+    def is_on(self, value: bool) -> None:
+        """Set the state. Used when state is updated outside Home Assistant."""
+        if self._state != value or not self._available:
+            self._state = value
+            # the bridge told us, so it can be reached again
+            self._available = True
+            self.async_write_ha_state()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
         try:
-            await asyncio.wait_for(
-                self.bridge.turn_on_switch(self._switch.room_id, self._switch.channel_id),
-                timeout=3.0,
-            )
-            self._state = True
-            self.async_write_ha_state()
-        except (RakoBridgeError, asyncio.TimeoutError):
-            if self._available:
-                _LOGGER.error("An error occurred while turning on the Rako Switch")
-            self._available = False
+            await self.bridge.async_queue_switch(self.room_id, self.channel_id, True)
+        except (RakoBridgeError, asyncio.TimeoutError) as ex:
+            self._async_command_failed(ex, "turning on")
             return
+        self.available = True
+        self.is_on = True
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
         try:
-            await asyncio.wait_for(
-                self.bridge.turn_off_switch(self._switch.room_id, self._switch.channel_id),
-                timeout=3.0,
-            )
-            self._state = False
-            self.async_write_ha_state()
-        except (RakoBridgeError, asyncio.TimeoutError):
-            if self._available:
-                _LOGGER.error("An error occurred while turning off the Rako Switch")
-            self._available = False
+            await self.bridge.async_queue_switch(self.room_id, self.channel_id, False)
+        except (RakoBridgeError, asyncio.TimeoutError) as ex:
+            self._async_command_failed(ex, "turning off")
             return
+        self.available = True
+        self.is_on = False
+
+    @callback
+    def _async_command_failed(self, ex: Exception, action: str) -> None:
+        """Go unavailable once commands keep failing despite their retries."""
+        if not self.bridge.commands_failing:
+            _LOGGER.debug("Rako Switch %s failed %s: %r", self.name, action, ex)
+            return
+        if self._available:
+            _LOGGER.error("An error occurred while %s the Rako Switch", action)
+        self.available = False
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
-        await self.bridge.register_for_state_updates(self)
+        await self.bridge.register_switch_for_state_updates(self)
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity about to be added to hass."""
-        await self.bridge.deregister_for_state_updates(self)
+        await self.bridge.deregister_switch_for_state_updates(self)
 
     @property
     def device_info(self) -> DeviceInfo:
-        """Return device information about this Rako Switch."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
-            "manufacturer": "Rako",
-            "suggested_area": self._switch.room_title,
-            "via_device": (DOMAIN, self.bridge.mac),
-        }
+        """Link this Rako Switch to its device, see devices.async_sync_devices."""
+        device_unique_id = self.bridge.get_device_unique_id(
+            self.room_id, self.channel_id
+        )
+        return DeviceInfo(identifiers={(DOMAIN, device_unique_id)})
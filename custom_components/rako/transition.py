@@ -0,0 +1,106 @@
+"""Stepped light transitions for a Rako Bridge."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING
+
+from python_rako.exceptions import RakoBridgeError
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .bridge import RakoBridge
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Fade:
+    start_level: int
+    end_level: int
+    start_time: float
+    duration: float
+    last_level: int
+    failed: Callable[[Exception], None]
+
+
+class RakoTransitionScheduler:
+    """Step all fading channels of a bridge from one shared timer.
+
+    Each tick queues at most one level per channel. The command queue
+    collapses superseded levels and batches the channels of one room. A
+    step that fails stops the fade of its channel and is reported to
+    failed, as a failed command of its light.
+    """
+
+    def __init__(self, hass: HomeAssistant, bridge: RakoBridge, tick: float) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.bridge = bridge
+        self.tick = tick
+        self._fades: dict[tuple[int, int], _Fade] = {}
+        self._tick_handle: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_start(
+        self,
+        room_id: int,
+        channel_id: int,
+        start_level: int,
+        end_level: int,
+        duration: float,
+        failed: Callable[[Exception], None],
+    ) -> None:
+        """Fade a channel from start_level to end_level over duration seconds."""
+        self._fades[(room_id, channel_id)] = _Fade(
+            start_level, end_level, self.hass.loop.time(), duration, start_level, failed
+        )
+        if self._tick_handle is None:
+            self._async_tick()
+
+    @callback
+    def async_cancel(self, room_id: int, channel_id: int) -> None:
+        """Stop fading a channel, e.g. because a new level was requested."""
+        self._fades.pop((room_id, channel_id), None)
+
+    @callback
+    def _async_tick(self) -> None:
+        self._tick_handle = None
+        now = self.hass.loop.time()
+        for (room_id, channel_id), fade in list(self._fades.items()):
+            progress = min((now - fade.start_time) / fade.duration, 1.0)
+            level = round(
+                fade.start_level + (fade.end_level - fade.start_level) * progress
+            )
+            if level != fade.last_level or progress >= 1.0:
+                fade.last_level = level
+                self.hass.async_create_task(
+                    self._async_send(room_id, channel_id, level, fade)
+                )
+            if progress >= 1.0:
+                del self._fades[(room_id, channel_id)]
+
+        if self._fades:
+            self._tick_handle = self.hass.loop.call_later(self.tick, self._async_tick)
+
+    async def _async_send(
+        self, room_id: int, channel_id: int, level: int, fade: _Fade
+    ) -> None:
+        try:
+            await self.bridge.async_queue_channel_brightness(room_id, channel_id, level)
+        except (RakoBridgeError, asyncio.TimeoutError) as ex:
+            key = (room_id, channel_id)
+            if self._fades.get(key) is fade:
+                del self._fades[key]
+            fade.failed(ex)
+
+    @callback
+    def shutdown(self) -> None:
+        """Stop all transitions."""
+        self._fades.clear()
+        if self._tick_handle:
+            self._tick_handle.cancel()
+            self._tick_handle = None
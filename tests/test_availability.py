@@ -0,0 +1,93 @@
+"""Tests for Rako entities recovering from failed commands."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import python_rako
+from python_rako.exceptions import RakoBridgeError
+from python_rako.model import ChannelStatusMessage, LevelCache, SceneCache
+import pytest
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.const import COMMAND_FAILURES_UNAVAILABLE, DOMAIN
+from custom_components.rako.light import RakoChannelLight
+
+MAC = "00:11:22:33:44:55"
+
+
+class _Light(RakoChannelLight):
+    """Count state writes instead of writing them to Home Assistant."""
+
+    state_writes = 0
+
+    def async_write_ha_state(self) -> None:
+        self.state_writes += 1
+
+
+def _create_bridge_with_light() -> tuple[RakoBridge, _Light]:
+    hass = SimpleNamespace(
+        data={DOMAIN: {}},
+        loop=asyncio.get_running_loop(),
+        async_create_task=asyncio.create_task,
+    )
+    bridge = RakoBridge("127.0.0.1", 9761, "test", MAC, "e", hass)
+    hass.data[DOMAIN][MAC] = {"rako_light_map": {}, "rako_switch_map": {}}
+    bridge._set_cache_state(LevelCache(), SceneCache())
+    light = _Light(
+        bridge, python_rako.ChannelLight(5, "Kitchen", 1, "Default", "Spots", "")
+    )
+    light.hass = hass
+    bridge._add_listening_light(light)
+    return bridge, light
+
+
+def _fail_commands(bridge: RakoBridge, light: _Light) -> None:
+    bridge.command_queue.consecutive_failures = COMMAND_FAILURES_UNAVAILABLE
+    light._async_command_failed(RakoBridgeError("no answer"))
+    assert not light.available
+
+
+@pytest.mark.asyncio
+async def test_available_after_status_message() -> None:
+    """A status message for an unavailable light makes it available again."""
+    bridge, light = _create_bridge_with_light()
+    _fail_commands(bridge, light)
+
+    bridge.async_dispatch_status(ChannelStatusMessage(5, 1, 128))
+    assert light.available
+    assert light.brightness == 128
+
+
+@pytest.mark.asyncio
+async def test_available_after_command_gets_through() -> None:
+    """Any command getting through makes the unavailable entities available."""
+    bridge, light = _create_bridge_with_light()
+    _fail_commands(bridge, light)
+
+    async def set_room_scene(room_id: int, scene: int) -> None:
+        pass
+
+    bridge.set_room_scene = set_room_scene  # type: ignore[method-assign]
+    await bridge.async_queue_room_scene(7, 1)
+    assert light.available
+    assert bridge.command_queue.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_unavailable_after_transition_step_fails() -> None:
+    """A failing step of a stepped transition is a failed command of its light."""
+    bridge, light = _create_bridge_with_light()
+    bridge.transitions.tick = 0.01
+    bridge.command_queue.consecutive_failures = COMMAND_FAILURES_UNAVAILABLE
+
+    async def queue_channel_brightness(
+        room_id: int, channel_id: int, brightness: int
+    ) -> None:
+        raise RakoBridgeError("no answer")
+
+    bridge.async_queue_channel_brightness = queue_channel_brightness  # type: ignore[method-assign]
+    await light.async_turn_on(brightness=255, transition=3)
+    await asyncio.sleep(0.05)
+    assert not light.available
+    assert not bridge.transitions._fades
@@ -0,0 +1,80 @@
+"""Tests for the Rako bridge."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from python_rako.model import LevelCache, LevelCacheItem, RoomChannel, SceneCache
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.storage import snapshot_from_state
+
+MAC = "00:11:22:33:44:55"
+
+
+@pytest.mark.asyncio
+async def test_resync_keeps_caches_without_levels() -> None:
+    """Empty caches from a bridge that didn't answer don't replace ours."""
+    hass = SimpleNamespace(data={}, loop=asyncio.get_running_loop())
+    bridge = RakoBridge("127.0.0.1", 9761, "test", MAC, "e", hass)
+    level_cache = LevelCache()
+    level_cache[RoomChannel(5, 1)] = LevelCacheItem(0, 5, 1, {1: 255})
+    bridge._set_cache_state(level_cache, SceneCache())
+
+    async def get_cache_state() -> tuple[LevelCache, SceneCache]:
+        return LevelCache(), SceneCache()
+
+    bridge.get_cache_state = get_cache_state  # type: ignore[method-assign]
+    await bridge._async_resync()
+    assert bridge.level_cache is level_cache
+    assert bridge.resyncs == 0
+
+
+@pytest.mark.asyncio
+async def test_no_reload_while_setting_up() -> None:
+    """A changed configuration only reloads a config entry that is set up."""
+    entry = SimpleNamespace(state=ConfigEntryState.SETUP_IN_PROGRESS)
+    reloads: list[str] = []
+
+    async def async_reload(entry_id: str) -> None:
+        reloads.append(entry_id)
+
+    hass = SimpleNamespace(
+        data={},
+        loop=asyncio.get_running_loop(),
+        config_entries=SimpleNamespace(
+            async_get_entry=lambda entry_id: entry, async_reload=async_reload
+        ),
+        async_create_task=asyncio.create_task,
+    )
+    bridge = RakoBridge("127.0.0.1", 9761, "test", MAC, "e", hass)
+    level_cache = LevelCache()
+    level_cache[RoomChannel(5, 1)] = LevelCacheItem(0, 5, 1, {1: 255})
+    saved = []
+
+    async def get_rako_xml(self: RakoBridge, session: object) -> str:
+        return "<rako>new</rako>"
+
+    async def get_cache_state() -> tuple[LevelCache, SceneCache]:
+        return level_cache, SceneCache()
+
+    async def async_save(data: object) -> None:
+        saved.append(data)
+
+    bridge.get_cache_state = get_cache_state  # type: ignore[method-assign]
+    bridge._snapshot_store = SimpleNamespace(async_save=async_save)
+    bridge._rako_xml_task = bridge._cache_state_task = hass.loop.create_future()
+    snapshot = snapshot_from_state("<rako>old</rako>", level_cache, SceneCache(), None)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("python_rako.bridge.Bridge.get_rako_xml", get_rako_xml)
+        await bridge._async_refresh_snapshot(None, snapshot)  # type: ignore[arg-type]
+        assert len(saved) == 1
+        assert reloads == []
+
+        entry.state = ConfigEntryState.LOADED
+        await bridge._async_refresh_snapshot(None, snapshot)  # type: ignore[arg-type]
+        await asyncio.sleep(0)
+        assert reloads == ["e"]
@@ -0,0 +1,180 @@
+"""Tests for the Rako command queue."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from python_rako.exceptions import RakoBridgeError
+from python_rako.model import LevelCache, LevelCacheItem, RoomChannel, SceneCache
+import pytest
+
+from custom_components.rako.bridge import RakoBridge
+from custom_components.rako.command_queue import RakoCommandQueue
+
+
+class _Bridge:
+    """Record the commands sent, blocking them until released."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.errors: list[Exception] = []
+
+    def command(self, name: str):  # type: ignore[no-untyped-def]
+        async def send() -> None:
+            self.sent.append(name)
+            await self.release.wait()
+            if self.errors:
+                raise self.errors.pop(0)
+
+        return send
+
+
+def _create_queue(**kwargs) -> RakoCommandQueue:  # type: ignore[no-untyped-def]
+    hass = SimpleNamespace(loop=asyncio.get_running_loop())
+    return RakoCommandQueue(hass, 3, 0.0, 1.0, **kwargs)
+
+
+async def _until(condition) -> None:  # type: ignore[no-untyped-def]
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_supersede_while_in_flight() -> None:
+    """Only the latest of the commands queued behind an in-flight one is sent."""
+    bridge = _Bridge()
+    queue = _create_queue()
+    bridge.release.clear()
+
+    first = asyncio.create_task(queue.async_send(1, 1, bridge.command("first")))
+    await _until(lambda: bridge.sent == ["first"])
+    second = asyncio.create_task(queue.async_send(1, 1, bridge.command("second")))
+    third = asyncio.create_task(queue.async_send(1, 1, bridge.command("third")))
+    await _until(lambda: queue.superseded_commands == 1)
+
+    bridge.release.set()
+    await asyncio.gather(first, second, third)
+    assert bridge.sent == ["first", "third"]
+
+
+@pytest.mark.asyncio
+async def test_retry_dropped_for_newer_command() -> None:
+    """A failed command isn't retried once a newer one for its key is queued."""
+    bridge = _Bridge()
+    queue = _create_queue(retries=2)
+    bridge.release.clear()
+    bridge.errors.append(RakoBridgeError("no answer"))
+
+    first = asyncio.create_task(queue.async_send(1, 1, bridge.command("first")))
+    await _until(lambda: bridge.sent == ["first"])
+    second = asyncio.create_task(queue.async_send(1, 1, bridge.command("second")))
+    await asyncio.sleep(0)
+
+    bridge.release.set()
+    # the newer command answers the callers of the failed one
+    await asyncio.gather(first, second)
+    assert bridge.sent == ["first", "second"]
+    assert queue.command_retries == 0
+    assert queue.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_failure() -> None:
+    """A failed command is retried while nothing newer is queued."""
+    bridge = _Bridge()
+    queue = _create_queue(retries=2)
+    bridge.errors.append(RakoBridgeError("no answer"))
+
+    await queue.async_send(1, 1, bridge.command("first"))
+    assert bridge.sent == ["first", "first"]
+    assert queue.command_retries == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_waiters() -> None:
+    """Shutdown cancels the callers of queued and in-flight commands."""
+    bridge = _Bridge()
+    queue = _create_queue()
+    bridge.release.clear()
+
+    in_flight = asyncio.create_task(queue.async_send(1, 1, bridge.command("first")))
+    await _until(lambda: bridge.sent == ["first"])
+    queued = asyncio.create_task(queue.async_send(1, 1, bridge.command("second")))
+    await asyncio.sleep(0)
+
+    queue.shutdown()
+    for task in (in_flight, queued):
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert bridge.sent == ["first"]
+
+
+def _create_bridge() -> tuple[RakoBridge, list[tuple]]:
+    hass = SimpleNamespace(data={}, loop=asyncio.get_running_loop())
+    bridge = RakoBridge("127.0.0.1", 9761, "test", "00:11:22:33:44:55", "e", hass)
+    level_cache = LevelCache()
+    for channel, levels in ((1, {1: 255, 3: 100}), (2, {1: 255, 3: 200})):
+        level_cache[RoomChannel(5, channel)] = LevelCacheItem(0, 5, channel, levels)
+    bridge._set_cache_state(level_cache, SceneCache())
+
+    sent: list[tuple] = []
+
+    async def set_room_scene(room_id: int, scene: int) -> None:
+        sent.append(("scene", room_id, scene))
+
+    async def set_channel_brightness(
+        room_id: int, channel_id: int, brightness: int
+    ) -> None:
+        sent.append(("level", room_id, channel_id, brightness))
+
+    bridge.set_room_scene = set_room_scene  # type: ignore[method-assign]
+    bridge.set_channel_brightness = set_channel_brightness  # type: ignore[method-assign]
+    return bridge, sent
+
+
+@pytest.mark.asyncio
+async def test_batch_matching_scene() -> None:
+    """Levels queued together for a room that match a scene recall the scene."""
+    bridge, sent = _create_bridge()
+
+    await asyncio.gather(
+        bridge.async_queue_channel_brightness(5, 1, 100),
+        bridge.async_queue_channel_brightness(5, 2, 200),
+    )
+    assert sent == [("scene", 5, 3)]
+    assert bridge.command_queue.batched_commands == 1
+    assert bridge.command_queue.command_rtt.count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_without_scene() -> None:
+    """Levels matching no scene are sent per channel, not sampled as one RTT."""
+    bridge, sent = _create_bridge()
+
+    await asyncio.gather(
+        bridge.async_queue_channel_brightness(5, 1, 10),
+        bridge.async_queue_channel_brightness(5, 2, 20),
+    )
+    assert sent == [("level", 5, 1, 10), ("level", 5, 2, 20)]
+    assert bridge.command_queue.batched_commands == 1
+    assert bridge.command_queue.command_rtt.count == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_backoff_per_command() -> None:
+    """Retries of a timed out command back off without slowing later commands."""
+    bridge = _Bridge()
+    queue = _create_queue(retries=1)
+    queue.rtt.timeout = 0.01
+    bridge.release.clear()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await queue.async_send(1, 1, bridge.command("first"))
+    assert bridge.sent == ["first", "first"]
+    assert queue.command_timeouts == 2
+    assert queue.rtt.timeout == 0.01
@@ -0,0 +1,45 @@
+"""Tests for the Rako command transport."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.rako.command_transport import RakoCommandTransport
+
+
+class _LateBridge(asyncio.DatagramProtocol):
+    """Answer the first command late and ignore the others."""
+
+    def __init__(self) -> None:
+        self.received = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.received += 1
+        if self.received == 1:
+            asyncio.get_running_loop().call_later(
+                0.05, self.transport.sendto, b"AOK\r\n", addr  # type: ignore[attr-defined]
+            )
+
+
+@pytest.mark.asyncio
+async def test_late_response_not_taken_for_next_command() -> None:
+    """The late response of a timed out command doesn't answer the next one."""
+    loop = asyncio.get_running_loop()
+    server, bridge = await loop.create_datagram_endpoint(
+        _LateBridge, local_addr=("127.0.0.1", 0)
+    )
+    transport = RakoCommandTransport("127.0.0.1", server.get_extra_info("sockname")[1])
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(transport.set_room_scene(5, 1), timeout=0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(transport.set_room_scene(5, 2), timeout=0.2)
+        assert bridge.received == 2
+        assert transport.sockets_opened == 2
+    finally:
+        transport.close()
+        server.close()